@@ -22,7 +22,7 @@ Outputs: workDir/summary.json plus the standard pipeline artifacts.
 Exit code: non-zero if pipeline or validation fails (strict health failures propagate).
 """
 from __future__ import annotations
-import argparse, json, subprocess, sys, datetime
+import argparse, json, subprocess, sys, time
 from pathlib import Path
 
 PY = sys.executable
@@ -63,7 +63,7 @@ def main(argv=None):
     if a.workDir:
         work = Path(a.workDir)
     else:
-        ts = datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        ts = time.strftime('%Y%m%d_%H%M%S', time.gmtime())
         work = ROOT / 'out' / f'run_{ts}'
     work.mkdir(parents=True, exist_ok=True)
 
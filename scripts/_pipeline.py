@@ -0,0 +1,290 @@
+"""Shared stage runner behind quick_demo.py and regenerate_artifacts.py.
+
+Stage graph (outputs inside ``PipelineConfig.out_dir``):
+ 1. scrape      -> pages.jsonl
+ 2. extract     -> insights_raw.jsonl
+ 3. classify    -> insights_classified.jsonl (+ run_manifest.json)
+ 4. diagnostics -> diagnostics.json
+ 5. health      -> health.json
+ 6. qualitative -> qualitative_examples.md
+ 7. audit       -> audit_evidence_labeltag.json
+ 8. calibrate   -> insights_classified_calibrated.jsonl (only with a calibration file)
+
+Each stage shells out to the corresponding CLI. Both front-ends only build a
+``PipelineConfig`` and format the returned result, so stage wiring lives here.
+"""
+from __future__ import annotations
+import json, subprocess, sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+SRC = Path(__file__).resolve().parents[1] / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from core.iojsonl import count_lines  # type: ignore
+
+STAGES = ('scrape', 'extract', 'classify', 'diagnostics', 'health', 'qualitative', 'audit', 'calibrate')
+
+ARTIFACTS = {
+    'scrape': 'pages.jsonl',
+    'extract': 'insights_raw.jsonl',
+    'classify': 'insights_classified.jsonl',
+    'diagnostics': 'diagnostics.json',
+    'health': 'health.json',
+    'qualitative': 'qualitative_examples.md',
+    'audit': 'audit_evidence_labeltag.json',
+    'calibrate': 'insights_classified_calibrated.jsonl',
+}
+
+# stage -> upstream stages whose outputs it reads
+UPSTREAM = {
+    'scrape': (),
+    'extract': ('scrape',),
+    'classify': ('extract',),
+    'diagnostics': ('classify',),
+    'health': ('classify',),
+    'qualitative': ('classify',),
+    'audit': ('extract', 'classify'),
+    'calibrate': ('classify',),
+}
+
+
+@dataclass
+class PipelineConfig:
+    url: str
+    out_dir: Path
+    # Crawl
+    max_pages: int = 50
+    max_depth: int = 2
+    rps: float = 1.0
+    per_page_link_cap: Optional[int] = None  # None: scrape.py default
+    seeds: list[str] = field(default_factory=list)  # non-empty -> multi_seed_scrape.py
+    fallback_seed: Optional[str] = None  # retried when the single seed yields 0 pages
+    min_pages: int = 0  # abort (insufficient_pages) below this page count
+    robots_fallback_allow: bool = False
+    user_agent: Optional[str] = None
+    browser_headers: bool = False
+    ua_rotate: Optional[str] = None
+    stealth_jitter: float = 0.0
+    pivot_fallback: Optional[str] = None
+    verbose: bool = False
+    # Extraction
+    min_insights: int = 50
+    max_insights: int = 110
+    min_len: Optional[int] = None
+    require_insights: bool = False  # abort (no_insights) when extraction yields nothing
+    # Classification
+    zero_shot: bool = False
+    self_train: bool = False
+    margin_gating: bool = False
+    conflict_dampener: bool = False
+    provisional_risk: bool = False
+    strong: Optional[float] = None
+    model_floor: Optional[float] = None
+    zero_shot_model: Optional[str] = None
+    debug: bool = False
+    # Health
+    strict_health: bool = False  # health runs before diagnostics and failure aborts the run
+    neutral_max: Optional[float] = None
+    min_support: Optional[float] = None
+    # Calibration
+    calibration: Optional[str] = None
+    # Partial evaluation: stages forced to run (None = run everything)
+    stages: Optional[set[str]] = None
+
+
+def sh(cmd: list[str], desc: str) -> bytes:
+    # Output stays bytes: it is written straight to disk or handed to json.loads,
+    # so decoding is only needed for the failure report.
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        out = proc.stdout.decode('utf-8', 'replace')
+        err = proc.stderr.decode('utf-8', 'replace')
+        sys.stderr.write(f"[{desc}] FAILED: {' '.join(cmd)}\nSTDOUT:\n{out}\nSTDERR:\n{err}\n")
+        raise SystemExit(1)
+    return proc.stdout
+
+
+def parse_stages(ap, value):
+    """Parse a --stages value into a set, reporting unknown names via ``ap.error``."""
+    if not value:
+        return None
+    selected = {s.strip() for s in value.split(',') if s.strip()}
+    unknown = selected - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stage(s): {','.join(sorted(unknown))} (choose from {','.join(STAGES)})")
+    return selected
+
+
+def artifact_paths(out_dir: Path) -> dict[str, Path]:
+    return {stage: out_dir / name for stage, name in ARTIFACTS.items()}
+
+
+def _is_stale(out: Path, deps: list[Path]) -> bool:
+    """True if ``out`` is missing or older than any existing dependency."""
+    if not out.exists():
+        return True
+    mtime = out.stat().st_mtime
+    return any(d.exists() and d.stat().st_mtime > mtime for d in deps)
+
+
+def plan_stages(cfg: PipelineConfig) -> dict[str, bool]:
+    """Decide which stages run (Make-style).
+
+    With ``cfg.stages`` unset everything runs. Otherwise a stage runs when it is
+    listed, when its output is stale, or when any upstream stage runs.
+    """
+    paths = artifact_paths(cfg.out_dir)
+    plan = {}
+    for name in STAGES:
+        if name == 'calibrate' and not cfg.calibration:
+            continue
+        upstream = UPSTREAM[name]
+        plan[name] = (
+            cfg.stages is None
+            or name in cfg.stages
+            or any(plan[u] for u in upstream)
+            or _is_stale(paths[name], [paths[u] for u in upstream])
+        )
+    return plan
+
+
+def _scrape(cfg: PipelineConfig, pages: Path) -> bool:
+    """Run the crawl; returns True when the fallback seed was used."""
+    if cfg.seeds:
+        cmd = [sys.executable, 'scripts/multi_seed_scrape.py', '--seeds', ','.join(cfg.seeds), '--out', str(pages), '--maxDepth', str(cfg.max_depth), '--rps', str(cfg.rps)]
+        # Derive per-seed cap to approximate maxPages (simple division); ensure >=1
+        per_seed_cap = max(1, cfg.max_pages // max(1, len(cfg.seeds)))
+        cmd += ['--maxPagesPerSeed', str(per_seed_cap)]
+        cmd += ['--perPageLinkCap', str(cfg.per_page_link_cap or 25)]
+        if cfg.robots_fallback_allow: cmd.append('--robotsFallbackAllow')
+        if cfg.browser_headers: cmd.append('--browserHeaders')
+        if cfg.user_agent: cmd += ['--userAgent', cfg.user_agent]
+        if cfg.ua_rotate: cmd += ['--uaRotate', cfg.ua_rotate]
+        if cfg.stealth_jitter: cmd += ['--stealthJitter', str(cfg.stealth_jitter)]
+        if cfg.pivot_fallback: cmd += ['--pivotFallback', cfg.pivot_fallback]
+        if cfg.verbose: cmd.append('--verbose')
+        sh(cmd, 'multi_seed_scrape')
+        return False
+
+    def run_scrape(seed: str):
+        cmd = [sys.executable, 'src/cli/scrape.py', '--url', seed, '--out', str(pages), '--maxPages', str(cfg.max_pages), '--maxDepth', str(cfg.max_depth), '--rps', str(cfg.rps)]
+        if cfg.per_page_link_cap is not None: cmd += ['--perPageLinkCap', str(cfg.per_page_link_cap)]
+        if cfg.robots_fallback_allow: cmd.append('--robotsFallbackAllow')
+        if cfg.verbose: cmd.append('--verbose')
+        if cfg.user_agent: cmd += ['--userAgent', cfg.user_agent]
+        if cfg.browser_headers: cmd.append('--browserHeaders')
+        sh(cmd, f'scrape({seed})')
+
+    run_scrape(cfg.url)
+    if cfg.fallback_seed and count_lines(pages) == 0:
+        sys.stderr.write(f'[warn] 0 pages from primary seed {cfg.url}; retrying with fallback {cfg.fallback_seed}\n')
+        run_scrape(cfg.fallback_seed)
+        return True
+    return False
+
+
+def _classify_cmd(cfg: PipelineConfig, raw: Path, classified: Path) -> list[str]:
+    cmd = [sys.executable, 'src/cli/classify.py', '--in', str(raw), '--out', str(classified)]
+    if cfg.zero_shot: cmd.append('--enable-zero-shot')
+    if cfg.self_train: cmd.append('--enable-self-train')
+    if cfg.margin_gating: cmd.append('--enable-margin-gating')
+    if cfg.conflict_dampener: cmd.append('--enable-conflict-dampener')
+    if cfg.provisional_risk: cmd.append('--enable-provisional-risk')
+    if cfg.strong is not None: cmd += ['--strong', str(cfg.strong)]
+    if cfg.model_floor is not None: cmd += ['--model-floor', str(cfg.model_floor)]
+    if cfg.zero_shot_model: cmd += ['--zero-shot-model', cfg.zero_shot_model]
+    if cfg.debug: cmd.append('--debug')
+    return cmd
+
+
+def _health(cfg: PipelineConfig, classified: Path, health: Path, run: bool) -> tuple[dict, int]:
+    """Run (or reload) the health check; returns (health_json, status code)."""
+    if not run:
+        try:
+            health_json = json.loads(health.read_bytes())
+        except ValueError:  # JSONDecodeError or undecodable bytes
+            health_json = {'status': 3, 'error': 'malformed_health_output'}
+        return health_json, health_json.get('status', 0)
+    cmd = [sys.executable, 'scripts/check_health.py', '--pred', str(classified)]
+    if cfg.neutral_max is not None: cmd += ['--neutral-max', str(cfg.neutral_max)]
+    if cfg.min_support is not None: cmd += ['--min-support', str(cfg.min_support)]
+    if cfg.strict_health: cmd.append('--strict')
+    # Non-strict runs tolerate a non-zero exit (soft issues)
+    proc = subprocess.run(cmd, capture_output=True)
+    health_out = proc.stdout or b'{}'
+    health.write_bytes(health_out)
+    try:
+        health_json = json.loads(health_out)
+    except ValueError:
+        health_json = {'status': 3, 'error': 'malformed_health_output'}
+    return health_json, proc.returncode
+
+
+def run_pipeline(cfg: PipelineConfig) -> dict:
+    """Run the planned stages and return a result dict.
+
+    Early aborts set ``result['error']`` (insufficient_pages, no_insights,
+    health_fail_strict) and stop before downstream stages; the caller decides
+    how to report them. Failed stage commands raise SystemExit(1).
+    """
+    plan = plan_stages(cfg)
+    paths = artifact_paths(cfg.out_dir)
+    pages, raw, classified = paths['scrape'], paths['extract'], paths['classify']
+    cfg.out_dir.mkdir(parents=True, exist_ok=True)
+    result = {'plan': plan, 'paths': paths, 'error': None, 'used_fallback': False}
+
+    # 1. Scrape (skipped when an up-to-date pages.jsonl is reused)
+    if plan['scrape']:
+        result['used_fallback'] = _scrape(cfg, pages)
+    result['page_count'] = count_lines(pages)
+    if result['page_count'] < cfg.min_pages:
+        result['error'] = 'insufficient_pages'
+        return result
+
+    # 2. Extract
+    if plan['extract']:
+        cmd = [sys.executable, 'src/cli/extract_insights.py', '--pages', str(pages), '--out', str(raw), '--minInsights', str(cfg.min_insights), '--maxInsights', str(cfg.max_insights)]
+        if cfg.min_len is not None: cmd += ['--minLen', str(cfg.min_len)]
+        sh(cmd, 'extract')
+    result['insight_count'] = count_lines(raw)
+    if cfg.require_insights and result['insight_count'] == 0:
+        result['error'] = 'no_insights'
+        return result
+
+    # 3. Classify
+    if plan['classify']:
+        sh(_classify_cmd(cfg, raw, classified), 'classify')
+
+    # 4/5. Diagnostics + health. Under strict health the (cheaper) health gate
+    # runs first so a failing run skips diagnostics, qualitative and audit.
+    def run_diagnostics():
+        if plan['diagnostics']:
+            paths['diagnostics'].write_bytes(sh([sys.executable, 'scripts/diagnostics_summary.py', '--pred', str(classified)], 'diagnostics'))
+
+    if cfg.strict_health:
+        result['health'], health_rc = _health(cfg, classified, paths['health'], plan['health'])
+        if health_rc != 0:
+            result['error'] = 'health_fail_strict'
+            return result
+        run_diagnostics()
+    else:
+        run_diagnostics()
+        result['health'], _ = _health(cfg, classified, paths['health'], plan['health'])
+
+    # 6. Qualitative examples
+    if plan['qualitative']:
+        sh([sys.executable, 'scripts/qualitative_examples.py', '--pred', str(classified), '--out', str(paths['qualitative'])], 'qualitative')
+
+    # 7. Evidence & tag audit
+    if plan['audit']:
+        sh([sys.executable, 'scripts/audit_evidence_labeltag.py', '--raw', str(raw), '--classified', str(classified), '--out', str(paths['audit'])], 'audit')
+
+    # 8. Calibration (optional)
+    if cfg.calibration and plan['calibrate']:
+        sh([sys.executable, 'scripts/apply_calibration.py', '--predictions', str(classified), '--calibration', cfg.calibration, '--out', str(paths['calibrate'])], 'apply_calibration')
+
+    result['classified_count'] = count_lines(classified)
+    return result
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Long-lived classifier worker speaking NDJSON over stdin/stdout.
+
+Keeps the ClassifierPipeline (self-train model, zero-shot transformers model)
+resident so callers classifying many batches pay the import/model load once
+instead of once per `classify.py` subprocess.
+
+Request (one JSON object per stdin line):
+  {"id": 1, "text": "...", "flags": {"enable_zero_shot": true}, "model": "models/selftrain"}
+  `flags` keys are PipelineConfig fields (unknown keys ignored); `flags` and `model` optional.
+Response (one line per request, flushed immediately, same order):
+  {"id": 1, "label": ..., "labelTag": ..., "rationale": ..., "confidence": ..., ...}
+  {"id": 1, "error": "..."} on malformed requests.
+
+Usage:
+  python scripts/classify_worker.py < requests.jsonl > responses.jsonl
+"""
+import json, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from insights.classifier_pipeline import PipelineConfig, get_pipeline  # type: ignore
+
+_VALID_FIELDS = set(PipelineConfig.__dataclass_fields__.keys())
+
+
+def handle(req) -> dict:
+    if not isinstance(req, dict):
+        return {'id': None, 'error': 'request_not_object'}
+    rid = req.get('id')
+    text = req.get('text')
+    if not isinstance(text, str) or not text:
+        return {'id': rid, 'error': 'missing_text'}
+    flags = req.get('flags') or {}
+    if not isinstance(flags, dict):
+        return {'id': rid, 'error': 'flags_not_object'}
+    cfg = PipelineConfig(**{k: v for k, v in flags.items() if k in _VALID_FIELDS})
+    pipe = get_pipeline(cfg, self_train_model_path=req.get('model'))
+    out = pipe.classify_text(text)
+    return {'id': rid, **out}
+
+
+def serve(inp=sys.stdin, out=sys.stdout) -> int:
+    for line in inp:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            resp = handle(json.loads(line))
+        except json.JSONDecodeError:
+            resp = {'id': None, 'error': 'invalid_json'}
+        except Exception as e:  # keep serving; report per-request failure
+            resp = {'id': None, 'error': f'{type(e).__name__}: {e}'}
+        out.write(json.dumps(resp, ensure_ascii=False) + '\n')
+        out.flush()
+    return 0
+
+
+def main():
+    sys.exit(serve())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,37 @@
 """One-shot demonstration script for the real workflow.
 
 Runs: scrape -> extract -> classify -> diagnostics -> health -> qualitative -> audit.
+With --strict-health the health gate runs before diagnostics and a failure exits 2
+without running diagnostics, qualitative or audit.
 Outputs placed in a timestamped directory under out/ (default root).
 
 Usage:
   python scripts/quick_demo.py --url https://www.eigenlayer.xyz
   python scripts/quick_demo.py --url https://www.eigenlayer.xyz --zero-shot --self-train
 
-This is a convenience wrapper with fewer flags than run_pipeline/regenerate_artifacts.
+This is a convenience wrapper with fewer flags than run_pipeline/regenerate_artifacts;
+stage wiring is shared with regenerate_artifacts via scripts/_pipeline.py.
 """
 from __future__ import annotations
-import argparse, subprocess, sys, json, datetime
+import argparse, sys, json, time
 from pathlib import Path
 
+from _pipeline import STAGES, PipelineConfig, parse_stages, plan_stages, run_pipeline
 
-def sh(cmd: list[str], desc: str):
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        sys.stderr.write(f"[{desc}] FAILED: {' '.join(cmd)}\nSTDOUT:\n{proc.stdout}\nSTDERR:\n{proc.stderr}\n")
-        raise SystemExit(1)
-    return proc.stdout
+EIGEN_SEEDS = [
+    'https://docs.eigenlayer.xyz',
+    'https://blog.eigenlayer.xyz',
+    # Some deployments use eigencloud domains (observed in live HTML)
+    'https://docs.eigencloud.xyz',
+    'https://blog.eigencloud.xyz',
+]
 
 
 def build_parser():
     p = argparse.ArgumentParser(description='Quick end-to-end demo runner')
     p.add_argument('--url', required=True)
     p.add_argument('--outRoot', default='out', help='Root output directory')
+    p.add_argument('--outDir', help='Fixed output directory (overrides timestamped dir under --outRoot; needed for incremental --stages runs)')
     p.add_argument('--maxPages', type=int, default=30)
     p.add_argument('--maxDepth', type=int, default=2)
     p.add_argument('--rps', type=float, default=1.0)
@@ -49,81 +55,68 @@ def build_parser():
     p.add_argument('--conflict-dampener', action='store_true')
     p.add_argument('--provisional-risk', action='store_true')
     p.add_argument('--strict-health', action='store_true')
+    p.add_argument('--stages', help=f"Comma-separated stages to force ({','.join(STAGES[:-1])}); other stages run only if their outputs are missing or stale")
+    p.add_argument('--dry-run', action='store_true', help='Print the stage plan (run/skip) and exit without running anything')
     return p
 
 
 def main(argv=None):
     ap = build_parser()
     a = ap.parse_args(argv)
+    selected = parse_stages(ap, a.stages)
+
+    if a.outDir:
+        out_dir = Path(a.outDir)
+    else:
+        ts = time.strftime('%Y%m%d_%H%M%S', time.gmtime())
+        out_dir = Path(a.outRoot) / f'demo_{ts}'
 
-    ts = datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-    out_dir = Path(a.outRoot) / f'demo_{ts}'
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    pages = out_dir / 'pages.jsonl'
-    raw_insights = out_dir / 'insights_raw.jsonl'
-    classified = out_dir / 'insights_classified.jsonl'
-    diagnostics = out_dir / 'diagnostics.json'
-    health = out_dir / 'health.json'
-    qualitative = out_dir / 'qualitative_examples.md'
-    audit = out_dir / 'audit_evidence_labeltag.json'
-
-    def run_scrape(seed: str):
-        cmd = [sys.executable, 'src/cli/scrape.py', '--url', seed, '--out', str(pages), '--maxPages', str(a.maxPages), '--maxDepth', str(a.maxDepth), '--rps', str(a.rps)]
-        if a.robots_fallback_allow: cmd.append('--robotsFallbackAllow')
-        if a.verbose: cmd.append('--verbose')
-        if a.user_agent: cmd += ['--userAgent', a.user_agent]
-        if a.browser_headers: cmd.append('--browserHeaders')
-        sh(cmd, f'scrape({seed})')
-
-    used_fallback = False
     multi_seed = []
     if a.eigen_mode:
-        multi_seed = [
-            a.url,  # user provided (should be main)
-            'https://docs.eigenlayer.xyz',
-            'https://blog.eigenlayer.xyz',
-            # Some deployments use eigencloud domains (observed in live HTML)
-            'https://docs.eigencloud.xyz',
-            'https://blog.eigencloud.xyz'
-        ]
+        multi_seed = [a.url] + EIGEN_SEEDS  # user provided url should be main
     if a.seeds:
         multi_seed = [s.strip() for s in a.seeds.split(',') if s.strip()]
 
-    if multi_seed:
-        # Use multi_seed_scrape helper
-        tmp_pages = pages  # final output file
-        cmd = [sys.executable, 'scripts/multi_seed_scrape.py', '--seeds', ','.join(multi_seed), '--out', str(tmp_pages), '--maxDepth', str(a.maxDepth), '--rps', str(a.rps)]
-        # Derive per-seed cap to approximate maxPages (simple division); ensure >=1
-        per_seed_cap = max(1, a.maxPages // max(1, len(multi_seed)))
-        cmd += ['--maxPagesPerSeed', str(per_seed_cap)]
-        cmd += ['--perPageLinkCap', '25']
-        if a.robots_fallback_allow: cmd.append('--robotsFallbackAllow')
-        if a.browser_headers: cmd.append('--browserHeaders')
-        if a.user_agent: cmd += ['--userAgent', a.user_agent]
-        if a.ua_rotate: cmd += ['--uaRotate', a.ua_rotate]
-        if a.stealth_jitter: cmd += ['--stealthJitter', str(a.stealth_jitter)]
-        if a.pivot_fallback: cmd += ['--pivotFallback', a.pivot_fallback]
-        if a.verbose: cmd.append('--verbose')
-        sh(cmd, 'multi_seed_scrape')
-    else:
-        # Single seed path
-        run_scrape(a.url)
-        page_count = sum(1 for _ in pages.open('r', encoding='utf-8')) if pages.exists() else 0
-        if page_count == 0 and a.allow_fallback:
-            sys.stderr.write(f'[warn] 0 pages from primary seed {a.url}; retrying with fallback {a.fallbackSeed}\n')
-            run_scrape(a.fallbackSeed)
-            page_count = sum(1 for _ in pages.open('r', encoding='utf-8')) if pages.exists() else 0
-            used_fallback = True
-
-    # Count pages after whichever path
-    page_count = sum(1 for _ in pages.open('r', encoding='utf-8')) if pages.exists() else 0
-    if page_count < a.minPages:
+    cfg = PipelineConfig(
+        url=a.url,
+        out_dir=out_dir,
+        max_pages=a.maxPages,
+        max_depth=a.maxDepth,
+        rps=a.rps,
+        seeds=multi_seed,
+        fallback_seed=a.fallbackSeed if a.allow_fallback else None,
+        min_pages=a.minPages,
+        robots_fallback_allow=a.robots_fallback_allow,
+        user_agent=a.user_agent,
+        browser_headers=a.browser_headers,
+        ua_rotate=a.ua_rotate,
+        stealth_jitter=a.stealth_jitter,
+        pivot_fallback=a.pivot_fallback,
+        verbose=a.verbose,
+        min_insights=a.minInsights,
+        max_insights=a.maxInsights,
+        require_insights=True,
+        zero_shot=a.zero_shot,
+        self_train=a.self_train,
+        margin_gating=a.margin_gating,
+        conflict_dampener=a.conflict_dampener,
+        provisional_risk=a.provisional_risk,
+        strict_health=a.strict_health,
+        stages=selected,
+    )
+    if a.dry_run:
+        plan = plan_stages(cfg)
+        print(json.dumps({'out_dir': str(out_dir), 'stages': {k: 'run' if v else 'skip' for k, v in plan.items()}}, indent=2))
+        return
+
+    res = run_pipeline(cfg)
+    paths = res['paths']
+    if res['error'] == 'insufficient_pages':
         summary = {
             'error': 'insufficient_pages',
-            'page_count': page_count,
+            'page_count': res['page_count'],
             'minPages': a.minPages,
-            'used_fallback': used_fallback,
+            'used_fallback': res['used_fallback'],
             'multi_seed': bool(multi_seed),
             'seeds': multi_seed or [a.url],
             'url': a.url,
@@ -132,48 +125,19 @@ def main(argv=None):
         }
         print(json.dumps(summary, indent=2))
         raise SystemExit(3)
-
-    # 2. Extract
-    sh([sys.executable, 'src/cli/extract_insights.py', '--pages', str(pages), '--out', str(raw_insights), '--minInsights', str(a.minInsights), '--maxInsights', str(a.maxInsights)], 'extract')
-    raw_count = sum(1 for _ in raw_insights.open('r', encoding='utf-8')) if raw_insights.exists() else 0
-    if raw_count == 0:
+    if res['error'] == 'no_insights':
         summary = {
             'error': 'no_insights',
-            'page_count': page_count,
+            'page_count': res['page_count'],
             'insight_count': 0,
             'url': a.url,
-            'used_fallback': used_fallback,
+            'used_fallback': res['used_fallback'],
             'out_dir': str(out_dir.resolve()),
         }
         print(json.dumps(summary, indent=2))
         raise SystemExit(4)
-
-    # 3. Classify
-    classify_cmd = [sys.executable, 'src/cli/classify.py', '--in', str(raw_insights), '--out', str(classified)]
-    if a.zero_shot: classify_cmd.append('--enable-zero-shot')
-    if a.self_train: classify_cmd.append('--enable-self-train')
-    if a.margin_gating: classify_cmd.append('--enable-margin-gating')
-    if a.conflict_dampener: classify_cmd.append('--enable-conflict-dampener')
-    if a.provisional_risk: classify_cmd.append('--enable-provisional-risk')
-    sh(classify_cmd, 'classify')
-
-    # 4. Diagnostics
-    diag_out = sh([sys.executable, 'scripts/diagnostics_summary.py', '--pred', str(classified)], 'diagnostics')
-    diagnostics.write_text(diag_out, encoding='utf-8')
-
-    # 5. Health
-    # Health: if non-strict, allow continuation even on issues (exit code swallowed)
-    health_cmd = [sys.executable, 'scripts/check_health.py', '--pred', str(classified)]
-    if a.strict_health:
-        health_cmd.append('--strict')
-    proc = subprocess.run(health_cmd, capture_output=True, text=True)
-    health_out = proc.stdout or '{}'
-    health.write_text(health_out, encoding='utf-8')
-    try:
-        health_json = json.loads(health_out)
-    except json.JSONDecodeError:
-        health_json = {'status': 3, 'error': 'malformed_health_output'}
-    if a.strict_health and proc.returncode != 0:
+    health_json = res['health']
+    if res['error'] == 'health_fail_strict':
         sys.stderr.write('Strict health gate failed (status !=0).\n')
         # Still emit final summary but mark failure in summary
         failure_summary = {
@@ -186,27 +150,20 @@ def main(argv=None):
         print(json.dumps(failure_summary, indent=2))
         raise SystemExit(2)
 
-    # 6. Qualitative examples
-    sh([sys.executable, 'scripts/qualitative_examples.py', '--pred', str(classified), '--out', str(qualitative)], 'qualitative')
-
-    # 7. Audit
-    sh([sys.executable, 'scripts/audit_evidence_labeltag.py', '--raw', str(raw_insights), '--classified', str(classified), '--out', str(audit)], 'audit')
-
-    classified_count = sum(1 for _ in classified.open('r', encoding='utf-8')) if classified.exists() else 0
     summary = {
         'url': a.url,
-        'used_fallback': used_fallback,
+        'used_fallback': res['used_fallback'],
         'out_dir': str(out_dir.resolve()),
-        'pages_file': str(pages),
-        'page_count': page_count,
-        'insights_raw_file': str(raw_insights),
-        'insight_count': raw_count,
-        'classified_file': str(classified),
-        'classified_count': classified_count,
-        'diagnostics': str(diagnostics),
-        'health': str(health),
-        'qualitative_examples': str(qualitative),
-        'audit': str(audit),
+        'pages_file': str(paths['scrape']),
+        'page_count': res['page_count'],
+        'insights_raw_file': str(paths['extract']),
+        'insight_count': res['insight_count'],
+        'classified_file': str(paths['classify']),
+        'classified_count': res['classified_count'],
+        'diagnostics': str(paths['diagnostics']),
+        'health': str(paths['health']),
+        'qualitative_examples': str(paths['qualitative']),
+        'audit': str(paths['audit']),
         'health_status': health_json.get('status', 0),
     }
     print(json.dumps(summary, indent=2))
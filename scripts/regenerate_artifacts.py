@@ -11,6 +11,9 @@ Sequence (default):
  8. (Optional) Apply calibration -> insights_classified_calibrated.jsonl
 
 Idempotent: existing output files are overwritten each run.
+Incremental: --stages forces the listed stages; other stages then only run
+when their output is missing or older than their inputs (Make-style).
+--dry-run prints the resulting run/skip plan without executing anything.
 
 Exit codes:
  0 success (or health warnings when not --strict)
@@ -20,18 +23,15 @@ Exit codes:
 Examples:
   python scripts/regenerate_artifacts.py --url https://www.eigenlayer.xyz --outDir out/eigen --enable-zero-shot --strict
   python scripts/regenerate_artifacts.py --url https://example.com --outDir out/example --calibration calibration/temperature.json
+  python scripts/regenerate_artifacts.py --url https://example.com --outDir out/example --stages audit
+
+Stage wiring is shared with quick_demo.py via scripts/_pipeline.py.
 """
 from __future__ import annotations
-import argparse, json, subprocess, sys
+import argparse, json, sys
 from pathlib import Path
 
-
-def run(cmd: list[str], desc: str):
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        sys.stderr.write(f"[{desc}] FAILED: {' '.join(cmd)}\nSTDOUT:\n{proc.stdout}\nSTDERR:\n{proc.stderr}\n")
-        raise SystemExit(1)
-    return proc.stdout.strip()
+from _pipeline import STAGES, PipelineConfig, parse_stages, plan_stages, run_pipeline
 
 
 def build_parser():
@@ -61,6 +61,9 @@ def build_parser():
     p.add_argument('--strict', action='store_true', help='Fail if health status != 0')
     p.add_argument('--neutral-max', type=float, default=0.92)
     p.add_argument('--min-support', type=float, default=0.01)
+    # Partial runs
+    p.add_argument('--stages', help=f"Comma-separated stages to force ({','.join(STAGES)}); other stages run only if their outputs are missing or stale")
+    p.add_argument('--dry-run', action='store_true', help='Print the stage plan (run/skip) and exit without running anything')
     return p
 
 
@@ -68,73 +71,53 @@ def main(argv=None):
     ap = build_parser()
     a = ap.parse_args(argv)
     out_dir = Path(a.outDir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    pages = out_dir / 'pages.jsonl'
-    insights_raw = out_dir / 'insights_raw.jsonl'
-    classified = out_dir / 'insights_classified.jsonl'
-    diagnostics = out_dir / 'diagnostics.json'
-    health = out_dir / 'health.json'
-    qualitative = out_dir / 'qualitative_examples.md'
-    audit = out_dir / 'audit_evidence_labeltag.json'
-    calibrated = out_dir / 'insights_classified_calibrated.jsonl'
-
-    # 1. Scrape
-    run([sys.executable, 'src/cli/scrape.py', '--url', a.url, '--out', str(pages), '--maxPages', str(a.maxPages), '--maxDepth', str(a.maxDepth), '--rps', str(a.rps), '--perPageLinkCap', str(a.perPageLinkCap)], 'scrape')
-
-    # 2. Extract
-    extract_cmd = [sys.executable, 'src/cli/extract_insights.py', '--pages', str(pages), '--out', str(insights_raw), '--minInsights', str(a.minInsights), '--maxInsights', str(a.maxInsights), '--minLen', str(a.minLen)]
-    run(extract_cmd, 'extract')
-
-    # 3. Classify
-    classify_cmd = [sys.executable, 'src/cli/classify.py', '--in', str(insights_raw), '--out', str(classified)]
-    if a.enable_zero_shot: classify_cmd.append('--enable-zero-shot')
-    if a.enable_conflict_dampener: classify_cmd.append('--enable-conflict-dampener')
-    if a.enable_margin_gating: classify_cmd.append('--enable-margin-gating')
-    if a.enable_provisional_risk: classify_cmd.append('--enable-provisional-risk')
-    if a.enable_self_train: classify_cmd.append('--enable-self-train')
-    if a.strong is not None: classify_cmd += ['--strong', str(a.strong)]
-    if a.model_floor is not None: classify_cmd += ['--model-floor', str(a.model_floor)]
-    if a.zero_shot_model: classify_cmd += ['--zero-shot-model', a.zero_shot_model]
-    if a.debug: classify_cmd.append('--debug')
-    run(classify_cmd, 'classify')
-
-    # 4. Diagnostics
-    diag_out = run([sys.executable, 'scripts/diagnostics_summary.py', '--pred', str(classified)], 'diagnostics')
-    diagnostics.write_text(diag_out, encoding='utf-8')
-
-    # 5. Health
-    health_out = run([sys.executable, 'scripts/check_health.py', '--pred', str(classified), '--neutral-max', str(a.neutral_max), '--min-support', str(a.min_support)], 'health')
-    health.write_text(health_out, encoding='utf-8')
-    health_json = json.loads(health_out)
-    if a.strict and health_json.get('status', 0) != 0:
+    cfg = PipelineConfig(
+        url=a.url,
+        out_dir=out_dir,
+        max_pages=a.maxPages,
+        max_depth=a.maxDepth,
+        rps=a.rps,
+        per_page_link_cap=a.perPageLinkCap,
+        min_insights=a.minInsights,
+        max_insights=a.maxInsights,
+        min_len=a.minLen,
+        zero_shot=a.enable_zero_shot,
+        self_train=a.enable_self_train,
+        margin_gating=a.enable_margin_gating,
+        conflict_dampener=a.enable_conflict_dampener,
+        provisional_risk=a.enable_provisional_risk,
+        strong=a.strong,
+        model_floor=a.model_floor,
+        zero_shot_model=a.zero_shot_model,
+        debug=a.debug,
+        strict_health=a.strict,
+        neutral_max=a.neutral_max,
+        min_support=a.min_support,
+        calibration=a.calibration,
+        stages=parse_stages(ap, a.stages),
+    )
+    if a.dry_run:
+        plan = plan_stages(cfg)
+        print(json.dumps({'outDir': str(out_dir), 'stages': {k: 'run' if v else 'skip' for k, v in plan.items()}}, indent=2))
+        return
+
+    res = run_pipeline(cfg)
+    if res['error'] == 'health_fail_strict':
         sys.stderr.write('Strict health gate failed.\n')
         raise SystemExit(2)
-
-    # 6. Qualitative examples
-    run([sys.executable, 'scripts/qualitative_examples.py', '--pred', str(classified), '--out', str(qualitative)], 'qualitative')
-
-    # 7. Evidence & tag audit
-    run([sys.executable, 'scripts/audit_evidence_labeltag.py', '--raw', str(insights_raw), '--classified', str(classified), '--out', str(audit)], 'audit')
-
-    # 8. Calibration (optional)
-    calibrated_out = None
-    if a.calibration:
-        run([sys.executable, 'scripts/apply_calibration.py', '--predictions', str(classified), '--calibration', a.calibration, '--out', str(calibrated)], 'apply_calibration')
-        calibrated_out = str(calibrated)
-
+    paths = res['paths']
     summary = {
         'url': a.url,
         'outDir': str(out_dir.resolve()),
-        'pages': str(pages),
-        'insights_raw': str(insights_raw),
-        'classified': str(classified),
-        'diagnostics': str(diagnostics),
-        'health': str(health),
-        'qualitative_examples': str(qualitative),
-        'audit': str(audit),
-        'calibrated': calibrated_out,
-        'strict_health_passed': health_json.get('passed', True),
+        'pages': str(paths['scrape']),
+        'insights_raw': str(paths['extract']),
+        'classified': str(paths['classify']),
+        'diagnostics': str(paths['diagnostics']),
+        'health': str(paths['health']),
+        'qualitative_examples': str(paths['qualitative']),
+        'audit': str(paths['audit']),
+        'calibrated': str(paths['calibrate']) if a.calibration else None,
+        'strict_health_passed': res['health'].get('passed', True),
     }
     print(json.dumps(summary, indent=2))
 
@@ -6,6 +6,7 @@ Stages:
  3. Classify insights -> insights_classified.jsonl (+ run_manifest.json)
  4. Diagnostics summary -> diagnostics.json
  5. Health check gate -> health.json (soft issues tolerated unless --strict)
+    (4 and 5 run concurrently; both only read insights_classified.jsonl)
  6. (Optional) Apply calibration (temperature scaling JSON) -> insights_classified_calibrated.jsonl
 
 This is a convenience wrapper around existing CLI tools so a single
@@ -35,7 +36,9 @@ Assumptions:
   - Zero-shot models will download on first use if enabled.
 """
 from __future__ import annotations
-import argparse, json, subprocess, sys, os, datetime
+import argparse, contextlib, importlib, io, json, subprocess, sys, os, tempfile, threading, time, traceback
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
 # When running from an installed package (console script), __file__ will
@@ -58,15 +61,142 @@ else:
     ROOT = _CWD  # always use invoking directory as logical output root when installed
     if str(_PKG_ROOT) not in sys.path:
         sys.path.insert(0, str(_PKG_ROOT))
+# Make `cli.*` / `scripts.*` importable for the in-process stage fast path
+for _p in (_PKG_ROOT / 'src', _PKG_ROOT) if _SOURCE_MODE else ():
+    if str(_p) not in sys.path:
+        sys.path.append(str(_p))
 
+# Resolved once at import: legacy scrape script (source checkouts only) and the startup banner
+_FALLBACK_SCRAPE_SCRIPT = (_PKG_ROOT / 'src' / 'cli' / 'scrape.py') if _SOURCE_MODE else None
+_BANNER = f"[pipeline] version={getattr(sys.modules.get('__main__'), '__package__', 'n/a')} source_mode={_SOURCE_MODE} output_root={ROOT}\n"
 
-def run(cmd: list[str], desc: str):
-    """Run a subprocess command, raising on any non‑zero exit code."""
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        sys.stderr.write(f"[{desc}] FAILED CMD: {' '.join(cmd)}\nSTDERR:\n{proc.stderr}\n")
+from core.iojsonl import count_lines, link_or_copy, write_bytes_atomic
+
+try:  # optional fast JSON (pip install tribute-pipeline[fast]); stdlib fallback
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads  # accepts str or bytes; JSONDecodeError subclasses json.JSONDecodeError
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# sys.argv and stdout/stderr redirection are process-global: one in-process stage at a time.
+_INPROCESS_LOCK = threading.Lock()
+
+
+def _run_inprocess(cmd: list[str]):
+    """Run ``python -m <module> ...`` by calling ``module.main()`` in this interpreter.
+
+    Avoids a fresh interpreter start plus re-import of heavy modules per stage.
+    Returns (returncode, stdout, stderr), or None when the module (or its
+    ``main``) cannot be imported so the caller falls back to a subprocess.
+    """
+    if len(cmd) < 3 or cmd[0] != sys.executable or cmd[1] != '-m':
+        return None
+    try:
+        entry = getattr(importlib.import_module(cmd[2]), 'main', None)
+    except ImportError:
+        return None
+    if entry is None:
+        return None
+    out, err = io.StringIO(), io.StringIO()
+    with _INPROCESS_LOCK:
+        saved_argv = sys.argv
+        sys.argv = [cmd[2]] + cmd[3:]
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                ret = entry()
+            code = ret if isinstance(ret, int) else 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:  # SystemExit("message") prints the message and exits 1
+                err.write(f"{e.code}\n")
+                code = 1
+        except Exception:
+            err.write(traceback.format_exc())
+            code = 1
+        finally:
+            sys.argv = saved_argv
+    return code, out.getvalue(), err.getvalue()
+
+
+def run(cmd: list[str], desc: str, want_stdout: bool = False):
+    """Run a stage command (in-process when possible), raising on any non‑zero exit code.
+
+    Child output is captured as bytes and only decoded when it is needed: stderr
+    on failure, stdout when ``want_stdout`` (otherwise returns ``''``).
+    """
+    res = _run_inprocess(cmd)
+    if res is None:
+        proc = subprocess.run(cmd, capture_output=True)
+        res = proc.returncode, proc.stdout, proc.stderr
+    returncode, stdout, stderr = res
+    if returncode != 0:
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode('utf-8', errors='replace')
+        sys.stderr.write(f"[{desc}] FAILED CMD: {' '.join(cmd)}\nSTDERR:\n{stderr}\n")
         raise SystemExit(1)
-    return proc.stdout.strip()
+    if not want_stdout:
+        return ''
+    if isinstance(stdout, bytes):
+        stdout = stdout.decode('utf-8')
+    return stdout.strip()
+
+def _write_outputs(writes: list[tuple[Path, bytes]], warn: bool = False) -> None:
+    """Write (path, payload) pairs concurrently, each atomically.
+
+    With ``warn`` a failed write is reported on stderr instead of raised.
+    """
+    def write_one(item):
+        path, data = item
+        try:
+            write_bytes_atomic(path, data)
+        except OSError as e:
+            if not warn:
+                raise
+            sys.stderr.write(f"[warn] could not write {path.name}: {e}\n")
+    with ThreadPoolExecutor(max_workers=len(writes)) as ex:
+        list(ex.map(write_one, writes))
+
+def _standalone_cmd(module: str, argv: list[str]) -> list[str]:
+    """Command for a src/cli stage that must run as a real child process.
+
+    Source checkouts run the script file (no install needed); installed
+    packages use ``-m cli.<module>``.
+    """
+    if _SOURCE_MODE:
+        return [sys.executable, str(_PKG_ROOT / 'src' / 'cli' / f'{module}.py')] + argv
+    return [sys.executable, '-m', f'cli.{module}'] + argv
+
+
+def _stream_scrape_extract(scrape_cmd: list[str], extract_cmd: list[str]):
+    """Pipe scrape (--echo) into extract (--pages -) so extraction overlaps crawling.
+
+    scrape still writes pages.jsonl itself; stderr goes to temp files so
+    neither child can block on a full pipe.
+    """
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    with tempfile.TemporaryFile() as scrape_err, tempfile.TemporaryFile() as extract_err:
+        scrape = subprocess.Popen(scrape_cmd, stdout=subprocess.PIPE, stderr=scrape_err, env=env)
+        extract = subprocess.Popen(extract_cmd, stdin=scrape.stdout, stdout=subprocess.DEVNULL, stderr=extract_err, env=env)
+        scrape.stdout.close()  # extract owns the read end; scrape gets EPIPE if extract dies
+        extract_rc = extract.wait()
+        scrape_rc = scrape.wait()
+        for desc, rc, cmd, err in (('scrape', scrape_rc, scrape_cmd, scrape_err), ('extract', extract_rc, extract_cmd, extract_err)):
+            if rc != 0:
+                err.seek(0)
+                sys.stderr.write(f"[{desc}] FAILED CMD: {' '.join(cmd)}\nSTDERR:\n{err.read().decode('utf-8', 'replace')}\n")
+                raise SystemExit(1)
+
 
 def _invoke(primary: list[str], fallback: list[str] | None, desc: str):
     """Try primary command; on failure optionally try fallback then re-raise with guidance."""
@@ -94,6 +224,7 @@ def build_parser():
     p.add_argument('--minLen', type=int, default=25)
     p.add_argument('--fuzzyDedupe', action='store_true')
     p.add_argument('--minhashFuzzy', action='store_true')
+    p.add_argument('--stream-extract', action='store_true', help='Pipe scrape output straight into extraction so both stages overlap (pages.jsonl is still written)')
     # Classification toggles (map to classify.py flags)
     p.add_argument('--enable-zero-shot', action='store_true')
     p.add_argument('--zero-shot-primary', action='store_true')
@@ -141,12 +272,11 @@ def main(argv=None):
         ap.error('Either --workDir must be provided or use --auto-workdir / --all')
 
     if args.auto_workdir:
-        # Use timezone-aware UTC to avoid deprecation warning
-        ts = datetime.datetime.now(datetime.UTC).strftime('%Y%m%d_%H%M%S')
+        ts = time.strftime('%Y%m%d_%H%M%S', time.gmtime())
         work = ROOT / 'out' / f'run_{ts}'
     else:
         work = Path(args.workDir)
-    work.mkdir(parents=True, exist_ok=True)
+    os.makedirs(work, exist_ok=True)
 
     pages_path = work / 'pages.jsonl'
     insights_raw_path = work / 'insights_raw.jsonl'
@@ -155,28 +285,33 @@ def main(argv=None):
     health_path = work / 'health.json'
 
     # Startup diagnostic banner (written early so user sees execution context)
-    sys.stderr.write(
-        f"[pipeline] version={getattr(sys.modules.get('__main__'), '__package__', 'n/a')} source_mode={_SOURCE_MODE} output_root={ROOT}\n"
-    )
-
-    # 1. Scrape (module first, legacy fallback only in source mode)
-    scrape_primary = [sys.executable, '-m', 'cli.scrape', '--url', args.url, '--out', str(pages_path), '--maxPages', str(args.maxPages), '--maxDepth', str(args.maxDepth), '--rps', str(args.rps), '--perPageLinkCap', str(args.perPageLinkCap)]
-    scrape_fallback = [sys.executable, 'src/cli/scrape.py', '--url', args.url, '--out', str(pages_path), '--maxPages', str(args.maxPages), '--maxDepth', str(args.maxDepth), '--rps', str(args.rps), '--perPageLinkCap', str(args.perPageLinkCap)] if _SOURCE_MODE else None
-    _invoke(scrape_primary, scrape_fallback, 'scrape')
-    # Alias for spec naming (scraped_pages.jsonl) -> duplicate for compatibility
+    sys.stderr.write(_BANNER)
+
+    scrape_args = ['--url', args.url, '--out', str(pages_path), '--maxPages', str(args.maxPages), '--maxDepth', str(args.maxDepth), '--rps', str(args.rps), '--perPageLinkCap', str(args.perPageLinkCap)]
+    extract_args = ['--out', str(insights_raw_path), '--minInsights', str(args.minInsights), '--maxInsights', str(args.maxInsights), '--minLen', str(args.minLen)]
+    if args.fuzzyDedupe:
+        extract_args.append('--fuzzyDedupe')
+    if args.minhashFuzzy:
+        extract_args.append('--minhashFuzzy')
+
+    # 1+2. Streaming: scrape --echo piped into extract --pages -
+    if args.stream_extract:
+        _stream_scrape_extract(_standalone_cmd('scrape', scrape_args + ['--echo']), _standalone_cmd('extract_insights', ['--pages', '-'] + extract_args))
+    else:
+        # 1. Scrape (module first, legacy fallback only in source mode)
+        scrape_primary = [sys.executable, '-m', 'cli.scrape'] + scrape_args
+        scrape_fallback = [sys.executable, str(_FALLBACK_SCRAPE_SCRIPT)] + scrape_args if _FALLBACK_SCRAPE_SCRIPT else None
+        _invoke(scrape_primary, scrape_fallback, 'scrape')
+    # Alias for spec naming (scraped_pages.jsonl): hardlink (symlink/copy fallback), no re-read
     scraped_alias = work / 'scraped_pages.jsonl'
     try:
-        scraped_alias.write_bytes(pages_path.read_bytes())
+        link_or_copy(pages_path, scraped_alias)
     except Exception as e:
         sys.stderr.write(f"[warn] Failed to create alias scraped_pages.jsonl: {e}\n")
 
     # 2. Extract
-    extract_cmd = [sys.executable, '-m', 'cli.extract_insights', '--pages', str(pages_path), '--out', str(insights_raw_path), '--minInsights', str(args.minInsights), '--maxInsights', str(args.maxInsights), '--minLen', str(args.minLen)]
-    if args.fuzzyDedupe:
-        extract_cmd.append('--fuzzyDedupe')
-    if args.minhashFuzzy:
-        extract_cmd.append('--minhashFuzzy')
-    run(extract_cmd, 'extract')
+    if not args.stream_extract:
+        run([sys.executable, '-m', 'cli.extract_insights', '--pages', str(pages_path)] + extract_args, 'extract')
 
     # 3. Classify
     classify_cmd = [sys.executable, '-m', 'cli.classify', '--in', str(insights_raw_path), '--out', str(insights_classified_path)]
@@ -196,25 +331,29 @@ def main(argv=None):
     if args.debug: classify_cmd.append('--debug')
     run(classify_cmd, 'classify')
 
-    # 4. Diagnostics summary
+    # 4. Diagnostics summary + 5. health check.
+    # Both only read insights_classified.jsonl, so the two subprocesses run concurrently.
     # diagnostics_summary expects --pred not --predictions
     # diagnostics_summary lives under scripts/ still; attempt module first, fallback to script path.
     diag_cmd = [sys.executable, '-m', 'scripts.diagnostics_summary', '--pred', str(insights_classified_path)]
-    diagnostics_out = run(diag_cmd, 'diagnostics')
-    diagnostics_path.write_text(diagnostics_out, encoding='utf-8')
-
-    # 5. Health check (tolerate exit code 1 unless --strict)
+    # Health: tolerate exit code 1 unless --strict
     neutral_max = args.maxNeutralPct
     health_cmd = [sys.executable, '-m', 'scripts.check_health', '--pred', str(insights_classified_path), '--neutral-max', str(neutral_max), '--min-support', str(args.minRiskPct)]
     if args.strict:
         health_cmd.append('--strict')
-    proc = subprocess.run(health_cmd, capture_output=True, text=True)
-    health_out = proc.stdout or '{}'
-    # Always write whatever we received so users can inspect even on failure
-    health_path.write_text(health_out, encoding='utf-8')
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        diag_future = ex.submit(run, diag_cmd, 'diagnostics', want_stdout=True)
+        health_future = ex.submit(subprocess.run, health_cmd, capture_output=True)
+        proc = health_future.result()
+        diagnostics_out = diag_future.result()
+
+    health_out = proc.stdout or b'{}'
+    # Always write whatever we received so users can inspect even on failure.
+    # Both land before validation, which reads them back from the workdir.
+    _write_outputs([(diagnostics_path, diagnostics_out.encode('utf-8')), (health_path, health_out)])
     try:
-        health = json.loads(health_out)
-    except json.JSONDecodeError:
+        health = _loads(health_out)
+    except ValueError:  # JSONDecodeError or non-UTF-8 output
         health = {'status': 3, 'error': 'malformed_health_output'}
     if args.strict and proc.returncode != 0:
         # Provide clear stderr context then abort
@@ -227,7 +366,7 @@ def main(argv=None):
             'health_issues': health.get('issues'),
             'error': 'health_fail_strict'
         }
-        print(json.dumps(failure_summary, indent=2))
+        print(_dumps(failure_summary).decode('utf-8'))
         raise SystemExit(2)
 
     # 6. Calibration application (optional)
@@ -253,24 +392,25 @@ def main(argv=None):
     validation_status = None
     if args.validate:
         validate_cmd = [sys.executable, '-m', 'scripts.validate_delivery', '--workDir', str(work), '--check-rationale-len', '200', '--strict']
-        val_proc = subprocess.run(validate_cmd, capture_output=True, text=True)
+        val_proc = subprocess.run(validate_cmd, capture_output=True)
+        validation_out = val_proc.stdout or b'{}'
         try:
-            validation_json = json.loads(val_proc.stdout or '{}')
+            validation_json = _loads(validation_out)
             validation_status = validation_json.get('status')
         except Exception:
             validation_status = 'unknown'
         summary['validation_status'] = validation_status
-        # Persist validation result
-        try:
-            (work / 'validation.json').write_text(val_proc.stdout or '{}', encoding='utf-8')
-        except Exception as e:
-            sys.stderr.write(f"[warn] could not write validation.json: {e}\n")
+
+    # One directory read for the summary's existence/size checks; DirEntry
+    # caches its stat so each artifact costs at most one lookup.
+    with os.scandir(work) as it:
+        entries = {e.name: e for e in it}
 
     # Derive label distribution from diagnostics.json
     label_dist = {}
     neutral_ratio = None
     try:
-        diag_obj = json.loads(diagnostics_path.read_text(encoding='utf-8'))
+        diag_obj = _loads(diagnostics_path.read_bytes())
         label_dist = diag_obj.get('label_dist') or {}
         neutral_ratio = diag_obj.get('neutral_ratio')
         summary['records'] = diag_obj.get('count')
@@ -279,35 +419,43 @@ def main(argv=None):
     summary['label_dist'] = label_dist
     summary['neutral_ratio'] = neutral_ratio
 
-    # Count insights (raw) for convenience
+    # Count insights (raw) for convenience. Size tells missing (-1) from
+    # empty (0, no need to open the file) from non-empty (count lines).
+    raw_entry = entries.get(insights_raw_path.name)
+    try:
+        raw_size = raw_entry.stat().st_size if raw_entry is not None else -1
+    except OSError:
+        raw_size = -1
     insight_count = None
-    if insights_raw_path.exists():
+    if raw_size == 0:
+        insight_count = 0
+    elif raw_size > 0:
         try:
-            with insights_raw_path.open('r', encoding='utf-8') as f:
-                insight_count = sum(1 for _ in f)
+            insight_count = count_lines(insights_raw_path)
         except Exception:
             insight_count = None
     summary['insight_count'] = insight_count
 
-    # Sample lines
-    if args.summary_lines > 0 and insights_classified_path.exists():
-        samples = []
-        with insights_classified_path.open('r', encoding='utf-8') as f:
-            for i, line in enumerate(f):
-                if i >= args.summary_lines: break
+    # Sample lines: slice the first N raw lines, then parse them in one call
+    if args.summary_lines > 0 and insights_classified_path.name in entries:
+        with insights_classified_path.open('rb') as f:
+            head = [line for line in islice(f, args.summary_lines) if line.strip()]
+        try:
+            recs = _loads(b'[' + b','.join(head) + b']')
+        except ValueError:  # a malformed line: parse individually and drop the bad ones
+            recs = []
+            for line in head:
                 try:
-                    rec = json.loads(line)
-                    samples.append({
-                        'label': rec.get('label'),
-                        'confidence': rec.get('confidence'),
-                        'text': (rec.get('text') or '')[:160]
-                    })
-                except Exception:
+                    recs.append(_loads(line))
+                except ValueError:
                     continue
-        summary['samples'] = samples
+        summary['samples'] = [
+            {'label': rec.get('label'), 'confidence': rec.get('confidence'), 'text': (rec.get('text') or '')[:160]}
+            for rec in recs if isinstance(rec, dict)
+        ]
 
     # Empty insights detection (extraction produced zero)
-    if insights_raw_path.exists() and insights_raw_path.stat().st_size == 0:
+    if raw_size == 0:
         summary['empty_insights'] = True
         sys.stderr.write('[warn] extraction produced 0 insights (consider adjusting filters or thresholds)\n')
 
@@ -328,14 +476,15 @@ def main(argv=None):
             print(f"  [{s['label']}] ({s['confidence']}) {s['text']}")
         print('========================\n')
 
-    # Persist summary.json for easier consumption by external tooling
-    try:
-        (work / 'summary.json').write_text(json.dumps(summary, indent=2), encoding='utf-8')
-    except Exception as e:  # pragma: no cover
-        sys.stderr.write(f"[warn] could not write summary.json: {e}\n")
+    # Persist summary.json (and the validation result) for external tooling
+    summary_out = _dumps(summary)
+    writes = [(work / 'summary.json', summary_out)]
+    if args.validate:
+        writes.append((work / 'validation.json', validation_out))
+    _write_outputs(writes, warn=True)
 
     # Always emit machine-parsable JSON last (stdout)
-    print(json.dumps(summary, indent=2))
+    print(summary_out.decode('utf-8'))
 
 
 def main_all():  # pragma: no cover - convenience wrapper for tribute-e2e
@@ -7,6 +7,8 @@ Checks:
   - insights_classified.jsonl have label, rationale, confidence, taxonomyVersion.
   - run_manifest.json includes schemaVersion, taxonomyVersion, tagVocabularyVersion.
   - diagnostics.json and health.json parse and contain expected keys.
+  - diagnostics label_dist / neutral_ratio agree with insights_classified.jsonl
+    when the whole file fits in the sample.
   - Optional synthetic generator script present.
 
 Usage:
@@ -15,9 +17,18 @@ Exit codes:
   0 success, 1 missing artifact / structural issue.
 """
 from __future__ import annotations
-import argparse, json, sys
+import argparse, json, os, sys
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 
+SRC = Path(__file__).resolve().parents[1] / 'src'
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from core.iojsonl import read_json, read_jsonl  # type: ignore
+
 REQUIRED_FILES = [
     'pages.jsonl',
     'insights_raw.jsonl',
@@ -27,21 +38,67 @@ REQUIRED_FILES = [
     'health.json'
 ]
 
-def first_n_jsonl(path: Path, n=10):
-    rows=[]
-    if not path.exists():
-        return rows
-    with path.open('r', encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
+ALLOWED_LABELS = frozenset({'Advantage', 'Risk', 'Neutral'})
+
+@dataclass(slots=True)
+class SampleStats:
+    """Per-check counters for the classified sample, filled in one pass."""
+    rows: int = 0
+    missing_label: int = 0
+    missing_rationale: int = 0
+    missing_conf: int = 0
+    missing_tax: int = 0
+    bad_conf: int = 0
+    over_rationale: int = 0
+    labels: Counter = field(default_factory=Counter)
+    tags: set = field(default_factory=set)
+
+def scan_classified(rows, max_rationale=0, counts=False) -> SampleStats:
+    """Fill SampleStats over ``rows``.
+
+    Confidence and rationale checks are only reported as present/absent, so
+    unless ``counts`` is set they stop being evaluated after the first hit.
+    """
+    st = SampleStats()
+    for r in rows:
+        st.rows += 1
+        if 'label' not in r: st.missing_label += 1
+        if 'rationale' not in r: st.missing_rationale += 1
+        if 'confidence' not in r: st.missing_conf += 1
+        if 'taxonomyVersion' not in r: st.missing_tax += 1
+        st.labels[r.get('label')] += 1
+        if counts or not st.bad_conf:
             try:
-                rows.append(json.loads(line))
-            except Exception:
-                continue
-            if len(rows) >= n:
-                break
-    return rows
+                if not 0.0 <= float(r.get('confidence',-1)) <= 1.0: st.bad_conf += 1
+            except (TypeError, ValueError):
+                st.bad_conf += 1
+        if max_rationale > 0 and (counts or not st.over_rationale) and len(r.get('rationale','')) > max_rationale:
+            st.over_rationale += 1
+        if 'labelTag' in r: st.tags.add(r['labelTag'])
+    return st
+
+def first_n_jsonl(path: Path, n=10):
+    try:
+        return list(islice(read_jsonl(path), n))
+    except FileNotFoundError:
+        return []
+
+JSON_ARTIFACTS = (
+    ('run_manifest.json', 'manifest', ('schemaVersion', 'taxonomyVersion', 'tagVocabularyVersion')),
+    ('diagnostics.json', 'diagnostics', ('count', 'label_dist', 'neutral_ratio')),
+    ('health.json', 'health', ('counts', 'status')),
+)
+
+def _load_json(path: Path, problems, label):
+    """Parse a JSON object artifact straight from bytes; records ``<label>_unreadable`` on failure."""
+    try:
+        obj = read_json(path)
+    except (OSError, ValueError):
+        obj = None
+    if not isinstance(obj, dict):
+        fail(f'{label}_unreadable', problems)
+        return None
+    return obj
 
 def fail(msg, problems):
     problems.append(msg)
@@ -52,16 +109,22 @@ def main(argv=None):
     ap.add_argument('--workDir', required=True)
     ap.add_argument('--strict', action='store_true', help='Treat any warning as failure')
     ap.add_argument('--check-rationale-len', type=int, default=0, help='If >0 enforce max rationale length in sample')
+    ap.add_argument('--verbose', action='store_true', help='Report exact per-check counts for the classified sample')
     ap.add_argument('--tag-vocab', default='tag_vocabulary.json', help='Path to tag vocabulary JSON file for labelTag membership check (optional).')
     args = ap.parse_args(argv)
     wd = Path(args.workDir)
     problems=[]
     warnings=[]
+    stats=None
 
-    # Existence
+    # Existence: one directory read instead of a stat() per required file
+    try:
+        with os.scandir(wd) as it:
+            present = {e.name for e in it}
+    except OSError:  # missing / unreadable workDir: everything is missing
+        present = set()
     for rel in REQUIRED_FILES:
-        p = wd/rel
-        if not p.exists():
+        if rel not in present:
             fail(f'missing_file:{rel}', problems)
 
     # Early abort if core files missing
@@ -111,60 +174,52 @@ def main(argv=None):
     if not classified_sample:
         fail('insights_classified_empty', problems)
     else:
-        need_fields={'label','rationale','confidence'}
-        for f in need_fields:
-            if not all(f in r for r in classified_sample): warnings.append(f'classified_missing_field:{f}')
-        if not any('taxonomyVersion' in r for r in classified_sample): warnings.append('classified_missing_taxonomyVersion')
-        # label domain
-        allowed_labels={'Advantage','Risk','Neutral'}
-        if not all(r.get('label') in allowed_labels for r in classified_sample):
-            warnings.append('unexpected_label_value')
-        # confidence bounds
-        if not all(0.0 <= float(r.get('confidence',-1)) <= 1.0 for r in classified_sample):
-            warnings.append('confidence_out_of_range')
-        # rationale length
-        if args.check_rationale_len>0:
-            if any(len(r.get('rationale',''))>args.check_rationale_len for r in classified_sample):
-                warnings.append('rationale_exceeds_max')
+        stats = scan_classified(classified_sample, args.check_rationale_len, counts=args.verbose)
+        for f, n in (('label', stats.missing_label), ('rationale', stats.missing_rationale), ('confidence', stats.missing_conf)):
+            if n: warnings.append(f'classified_missing_field:{f}')
+        if stats.missing_tax == stats.rows: warnings.append('classified_missing_taxonomyVersion')
+        # Domain checks are C-level set differences over the distinct values
+        bad_labels = stats.labels.keys() - ALLOWED_LABELS
+        if bad_labels: warnings.append('unexpected_label_value:' + ','.join(sorted(map(str, bad_labels))))
+        if stats.bad_conf: warnings.append('confidence_out_of_range')
+        if stats.over_rationale: warnings.append('rationale_exceeds_max')
         # tag vocabulary membership (if vocab found and not empty)
         if vocab:
-            if not any('labelTag' in r for r in classified_sample):
+            bad_tags = stats.tags - vocab
+            if not stats.tags:
                 warnings.append('labelTag_missing')
-            else:
-                if not all(r.get('labelTag') in vocab for r in classified_sample if 'labelTag' in r):
-                    warnings.append('labelTag_out_of_vocab')
-
-    # manifest
-    try:
-        manifest=json.loads((wd/'run_manifest.json').read_text(encoding='utf-8'))
-        for key in ['schemaVersion','taxonomyVersion','tagVocabularyVersion']:
-            if key not in manifest:
-                warnings.append(f'manifest_missing:{key}')
-    except Exception:
-        fail('manifest_unreadable', problems)
-
-    # diagnostics
-    try:
-        diag=json.loads((wd/'diagnostics.json').read_text(encoding='utf-8'))
-        for key in ['count','label_dist','neutral_ratio']:
-            if key not in diag:
-                warnings.append(f'diagnostics_missing:{key}')
-    except Exception:
-        fail('diagnostics_unreadable', problems)
-
-    # health
-    try:
-        health=json.loads((wd/'health.json').read_text(encoding='utf-8'))
-        for key in ['counts','status']:
-            if key not in health:
-                warnings.append(f'health_missing:{key}')
-    except Exception:
-        fail('health_unreadable', problems)
+            elif bad_tags:
+                warnings.append('labelTag_out_of_vocab:' + ','.join(sorted(map(str, bad_tags))))
+
+    # JSON artifacts: required keys per file (missing keys are warnings)
+    artifacts = {}
+    for rel, label, keys in JSON_ARTIFACTS:
+        obj = artifacts[label] = _load_json(wd/rel, problems, label)
+        if obj is not None:
+            warnings.extend(f'{label}_missing:{key}' for key in keys if key not in obj)
+
+    # Cross-check diagnostics against the label counts from the classified scan
+    # when the sample covered the whole file (small runs, smoke demos).
+    diag = artifacts['diagnostics']
+    if diag is not None and stats is not None and diag.get('count') == stats.rows:
+        # diagnostics.json went through JSON, so a missing label is keyed "null"
+        labels = {('null' if k is None else str(k)): v for k, v in stats.labels.items()}
+        if diag.get('label_dist') != labels:
+            warnings.append('diagnostics:label_dist_mismatch')
+        reported = diag.get('neutral_ratio')
+        neutral_ratio = stats.labels['Neutral'] / max(stats.rows, 1)
+        if isinstance(reported, (int, float)) and abs(reported - neutral_ratio) > 5e-4:
+            warnings.append('diagnostics:neutral_ratio_mismatch')
 
     status='pass'
     if problems or (args.strict and warnings):
         status='fail'
     out={'status':status,'problems':problems,'warnings':warnings,'workDir':str(wd.resolve())}
+    if args.verbose and stats is not None:
+        out['classifiedSample'] = {'rows': stats.rows, 'missing_label': stats.missing_label,
+                                   'missing_rationale': stats.missing_rationale, 'missing_conf': stats.missing_conf,
+                                   'missing_tax': stats.missing_tax, 'bad_conf': stats.bad_conf,
+                                   'over_rationale': stats.over_rationale, 'labels': dict(stats.labels)}
     print(json.dumps(out, indent=2))
     sys.exit(0 if status=='pass' else 1)
 
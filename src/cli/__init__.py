@@ -0,0 +1,33 @@
+"""Command-line entry points for the tribute pipeline."""
+from __future__ import annotations
+import os, re, sys
+
+DIST_NAME = 'tribute-pipeline'
+
+
+def package_version() -> str:
+    """Installed distribution version, else the one in a source checkout's pyproject.toml."""
+    from importlib import metadata
+    try:
+        return metadata.version(DIST_NAME)
+    except metadata.PackageNotFoundError:
+        pass
+    pyproject = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'pyproject.toml')
+    try:
+        with open(pyproject, encoding='utf-8') as f:
+            m = re.search(r'^version\s*=\s*"([^"]+)"', f.read(), re.M)
+    except OSError:
+        m = None
+    return m.group(1) if m else 'unknown'
+
+
+def print_version_if_requested(argv=None) -> bool:
+    """Print ``<dist> <version>`` and return True when argv is just ``-V``/``--version``.
+
+    Called before a CLI builds its parser so version probes skip argparse setup.
+    """
+    args = sys.argv[1:] if argv is None else list(argv)
+    if args not in (['-V'], ['--version']):
+        return False
+    sys.stdout.write(f'{DIST_NAME} {package_version()}\n')
+    return True
@@ -0,0 +1,55 @@
+"""Single entry point: ``python -m cli <subcommand> [options]``.
+
+Only the module for the requested subcommand is imported, and only its parser
+is built; ``python -m cli extract --help`` never touches the other five.
+The per-script entry points keep working unchanged.
+"""
+from __future__ import annotations
+import importlib, sys
+
+from cli import print_version_if_requested
+
+SUBCOMMANDS = {
+    'extract': 'cli.extract_insights',
+    'reports': 'cli.generate_reports',
+    'label-dist': 'cli.label_distribution',
+    'pipeline': 'cli.pipeline_e2e',
+    'seed': 'cli.prepare_seed_batch',
+    'seed-balanced': 'cli.prepare_balanced_seed_batch',
+}
+
+USAGE = 'usage: python -m cli [-V] {%s} [options]\n' % ','.join(SUBCOMMANDS)
+
+
+def _sniff_subcommand(argv):
+    """Return (index, name) of the first non-flag token in argv, or (None, None)."""
+    for i, tok in enumerate(argv):
+        if not tok.startswith('-'):
+            return i, tok
+    return None, None
+
+
+def main(argv=None):
+    from_cmdline = argv is None
+    argv = sys.argv[1:] if from_cmdline else list(argv)
+    idx, name = _sniff_subcommand(argv)
+    if name is None:
+        if print_version_if_requested(argv):
+            return 0
+        if '-h' in argv or '--help' in argv:
+            sys.stdout.write(USAGE)
+            return 0
+        sys.stderr.write(USAGE + 'error: a subcommand is required\n')
+        return 2
+    if name not in SUBCOMMANDS:
+        sys.stderr.write(USAGE + f'error: unknown subcommand {name!r}\n')
+        return 2
+    if from_cmdline:
+        # argparse derives prog from argv[0]; show 'cli extract' rather than '__main__.py'
+        sys.argv[0] = f'cli {name}'
+    # Flags given before the subcommand (e.g. ``--help extract``) go to it too
+    return importlib.import_module(SUBCOMMANDS[name]).main(argv[:idx] + argv[idx + 1:])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
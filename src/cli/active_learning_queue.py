@@ -14,30 +14,40 @@ Output: top N records ordered by descending score with fields:
 Usage:
   python src/cli/active_learning_queue.py --in out/ensemble.labeled.v2.jsonl --out out/active_queue.jsonl --top 30
 """
-import argparse, json, math
+import argparse, heapq, json, os, sys
+from operator import itemgetter
 from typing import List, Dict
 
+import numpy as np
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from core.iojsonl import dumps_line, read_jsonl as iter_jsonl
+
+LABEL_ORDER = ('Advantage', 'Risk', 'Neutral')
 
 def entropy(probs: Dict[str,float]) -> float:
-    if not probs:
-        return 0.0
-    total = sum(probs.values()) or 1.0
-    e = 0.0
-    for p in probs.values():
-        if p <= 0: continue
-        p/=total
-        e -= p*math.log(p,2)
-    return e
+    """Shannon entropy (bits) of one record's normalised ``modelProbs``."""
+    return float(batch_entropy([probs])[0])
+
+def batch_entropy(prob_dicts: List[Dict[str,float]]) -> np.ndarray:
+    """Vectorized ``entropy`` over many records: one (N, K) array, no per-value Python loop.
+
+    Columns follow LABEL_ORDER, plus any other labels present (sorted).
+    Non-positive entries contribute nothing; all-zero rows give 0.0.
+    """
+    extra = sorted({k for d in prob_dicts for k in d} - set(LABEL_ORDER))
+    labels = LABEL_ORDER + tuple(extra)
+    P = np.array([[d.get(l, 0.0) for l in labels] for d in prob_dicts], dtype=np.float64).reshape(len(prob_dicts), len(labels))
+    total = P.sum(axis=1, keepdims=True)
+    total[total == 0] = 1.0
+    Q = P / total
+    logQ = np.log2(Q, out=np.zeros_like(Q), where=P > 0)
+    # + 0.0 normalises the -0.0 that negating an all-zero row would give
+    return -(Q * logQ).sum(axis=1) + 0.0
 
 def main():
     ap = argparse.ArgumentParser()
@@ -47,9 +57,9 @@ def main():
     args = ap.parse_args()
 
     items = []
+    disagree = []
     for rec in iter_jsonl(args.inp):
         probs = rec.get('modelProbs') or {}
-        e = entropy(probs)
         heur_label = 'Unknown'
         prov = rec.get('classificationProvenance') or []
         # heuristic label is ambiguous; approximate via signals + ruleStrength: treat signals presence & ruleStrength>0.75 as that label
@@ -62,22 +72,26 @@ def main():
         nli_disagree = 0.0
         if nli and nli.get('label') and nli.get('label') != final_label:
             nli_disagree = 0.5
-        score = e + 0.6*heuristic_disagree + 0.4*nli_disagree
+        disagree.append(0.6*heuristic_disagree + 0.4*nli_disagree)
         items.append({
             'text': rec.get('text'),
             'label': final_label,
             'modelProbs': probs,
             'ruleStrength': rec.get('ruleStrength'),
             'finalConfidence': rec.get('finalConfidence'),
-            'entropy': round(e,3),
-            'score': round(score,3)
         })
 
-    items.sort(key=lambda x: x['score'], reverse=True)
-    top_items = items[:args.top]
-    with open(args.out,'w',encoding='utf-8') as w:
-        for it in top_items:
-            w.write(json.dumps(it, ensure_ascii=False) + '\n')
+    # Entropy for every record in one array pass, then fill fields by index
+    entropies = batch_entropy([it['modelProbs'] for it in items])
+    scores = entropies + np.asarray(disagree, dtype=float)
+    for it, e, score in zip(items, entropies.tolist(), scores.tolist()):
+        it['entropy'] = round(e,3)
+        it['score'] = round(score,3)
+
+    # O(N log top) and stable on ties, same order as a full reverse sort
+    top_items = heapq.nlargest(args.top, items, key=itemgetter('score'))
+    with open(args.out,'wb') as w:
+        w.writelines([dumps_line(it) for it in top_items])
     print(json.dumps({'input': args.inp, 'written': len(top_items), 'out': args.out}))
 
 if __name__ == '__main__':
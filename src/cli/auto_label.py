@@ -16,8 +16,11 @@ Usage:
   python src/cli/auto_label.py --in data/seed_batch_balanced.v1.jsonl --out data/seed_labeled.auto.jsonl --mode hybrid --modelDir models/seed_distilbert
 """
 import argparse, json, sys, os, time
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
@@ -28,6 +31,20 @@ from insights.tag_inference import infer_with_validation
 from insights.adin_taxonomy import TAXONOMY_VERSION
 from insights.rationale import build_rationale as build_tag_rationale
 from insights.backends import load_backend
+from core.iojsonl import dumps_line, read_jsonl as iter_jsonl
+
+
+# Memoized call sites: identical texts (duplicates within a batch, across modes
+# or repeats) pay for heuristic/tag inference once. Bounded so huge corpora
+# of unique texts cannot grow the caches without limit.
+@lru_cache(maxsize=100_000)
+def _heur(text: str):
+    return heuristic_classify(text)
+
+
+@lru_cache(maxsize=100_000)
+def _tag(text: str):
+    return infer_with_validation(text)
 
 
 def build_parser():
@@ -39,18 +56,36 @@ def build_parser():
     p.add_argument('--hybridRiskThreshold', type=float, default=0.65)
     p.add_argument('--hybridAdvThreshold', type=float, default=0.60)
     p.add_argument('--includeRationale', action='store_true')
+    p.add_argument('--batchSize', type=int, default=64, help='Records per backend.predict_proba call (ml/hybrid)')
     return p
 
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+def iter_batches(items, size: int):
+    """Yield lists of up to ``size`` items so memory stays bounded on large inputs."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def temperature_scale(prob_dicts, T: float):
+    """Temperature-scale a batch of per-label probability dicts in one array op.
+
+    Each probability is clipped, mapped to its logit, divided by ``T`` and the
+    row re-normalised with a (max-shifted) softmax.
+    """
+    if not prob_dicts:
+        return prob_dicts
+    labs = list(prob_dicts[0].keys())
+    P = np.clip(np.array([[d[l] for l in labs] for d in prob_dicts], dtype=float), 1e-9, 1-1e-9)
+    scaled = (np.log(P) - np.log(1-P)) / T
+    E = np.exp(scaled - scaled.max(axis=1, keepdims=True))
+    probs = E / E.sum(axis=1, keepdims=True)
+    return [dict(zip(labs, row)) for row in probs.tolist()]
 
 
 def main(argv=None):
@@ -67,64 +102,60 @@ def main(argv=None):
                 calibration = json.loads(calib_path.read_text(encoding='utf-8'))
             except Exception:
                 calibration = None
+    temperature = None
+    if calibration and calibration.get('temperature') not in (None,1.0):
+        temperature = float(calibration['temperature'])
     start = time.time()
     count = 0
-    with open(args.out,'w',encoding='utf-8') as w:
-        for obj in iter_jsonl(args.inp):
-            text = obj.get('text')
-            if not text:
-                continue
-            heur = heuristic_classify(text)
-            model_probs = None
-            final_label = heur.label
-            if backend:
-                raw_probs = backend.predict_proba([text])[0]
-                if calibration and calibration.get('temperature') not in (None,1.0):
-                    T = float(calibration['temperature'])
-                    import math as _m
-                    labs = list(raw_probs.keys())
-                    vals=[min(max(raw_probs[l],1e-9),1-1e-9) for l in labs]
-                    logits=[_m.log(v)-_m.log(1-v) for v in vals]
-                    scaled=[lg/ T for lg in logits]
-                    m=max(scaled)
-                    exps=[_m.exp(s-m) for s in scaled]
-                    z=sum(exps) or 1.0
-                    model_probs={labs[i]: exps[i]/z for i in range(len(labs))}
-                else:
+    with open(args.out,'wb') as w:
+        for batch in iter_batches((obj for obj in iter_jsonl(args.inp) if obj.get('text')), max(1, args.batchSize)):
+            texts = [obj['text'] for obj in batch]
+            # One predict_proba call per microbatch instead of one per record
+            batch_probs = backend.predict_proba(texts) if backend else [None] * len(batch)
+            if backend and temperature is not None:
+                batch_probs = temperature_scale(batch_probs, temperature)
+            lines = []
+            for obj, text, raw_probs in zip(batch, texts, batch_probs):
+                heur = _heur(text)
+                model_probs = None
+                final_label = heur.label
+                if backend:
                     model_probs = raw_probs
-                if args.mode == 'ml':
-                    final_label = max(model_probs.items(), key=lambda kv: kv[1])[0]
-                elif args.mode == 'hybrid':
-                    risk_p = model_probs.get('Risk',0.0)
-                    adv_p = model_probs.get('Advantage',0.0)
-                    if final_label != 'Risk' and risk_p >= args.hybridRiskThreshold:
-                        final_label = 'Risk'
-                    elif final_label == 'Neutral' and adv_p >= args.hybridAdvThreshold:
-                        final_label = 'Advantage'
-            # Tag inference for taxonomy alignment
-            tag_inf = infer_with_validation(text)
-            # If tag inference produces Risk but final isn't risk, prefer risk precedence
-            if tag_inf.label == 'Risk' and final_label != 'Risk':
-                final_label = 'Risk'
-            conf = None
-            if model_probs:
-                conf = model_probs.get(final_label,0.0)
-            else:
-                base = {'Risk':0.9,'Advantage':0.7,'Neutral':0.4}[final_label]
-                conf = base + min(len(heur.signals)*0.05,0.25)
-            if conf > 1.0: conf = 1.0
-            rec = dict(obj)
-            rec['label'] = final_label
-            rec['autoLabelMode'] = args.mode
-            rec['autoLabelConfidence'] = round(conf,3)
-            rec['taxonomyVersion'] = TAXONOMY_VERSION
-            rec['labelTag'] = tag_inf.tag
-            if model_probs:
-                rec['probs'] = model_probs
-            if args.includeRationale:
-                rec['rationale_auto'] = build_tag_rationale(final_label, tag_inf.tag, heur.signals, [])
-            w.write(json.dumps(rec, ensure_ascii=False) + '\n')
-            count += 1
+                    if args.mode == 'ml':
+                        final_label = max(model_probs.items(), key=lambda kv: kv[1])[0]
+                    elif args.mode == 'hybrid':
+                        risk_p = model_probs.get('Risk',0.0)
+                        adv_p = model_probs.get('Advantage',0.0)
+                        if final_label != 'Risk' and risk_p >= args.hybridRiskThreshold:
+                            final_label = 'Risk'
+                        elif final_label == 'Neutral' and adv_p >= args.hybridAdvThreshold:
+                            final_label = 'Advantage'
+                # Tag inference for taxonomy alignment
+                tag_inf = _tag(text)
+                # If tag inference produces Risk but final isn't risk, prefer risk precedence
+                if tag_inf.label == 'Risk' and final_label != 'Risk':
+                    final_label = 'Risk'
+                conf = None
+                if model_probs:
+                    conf = model_probs.get(final_label,0.0)
+                else:
+                    base = {'Risk':0.9,'Advantage':0.7,'Neutral':0.4}[final_label]
+                    conf = base + min(len(heur.signals)*0.05,0.25)
+                if conf > 1.0: conf = 1.0
+                rec = obj  # freshly parsed by iter_jsonl and written once below: no copy needed
+                rec['label'] = final_label
+                rec['autoLabelMode'] = args.mode
+                rec['autoLabelConfidence'] = round(conf,3)
+                rec['taxonomyVersion'] = TAXONOMY_VERSION
+                rec['labelTag'] = tag_inf.tag
+                if model_probs:
+                    rec['probs'] = model_probs
+                if args.includeRationale:
+                    rec['rationale_auto'] = build_tag_rationale(final_label, tag_inf.tag, heur.signals, [])
+                lines.append(dumps_line(rec))
+            # One bulk write per microbatch
+            w.writelines(lines)
+            count += len(lines)
     elapsed = time.time() - start
     sys.stdout.write(json.dumps({'count': count, 'seconds': round(elapsed,3), 'items_per_sec': round(count/(elapsed+1e-6),2)}) + '\n')
 
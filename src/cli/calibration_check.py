@@ -8,19 +8,18 @@ Otherwise uses pseudo accuracy proxy: treat final label as truth (report only co
 Usage:
   python src/cli/calibration_check.py --in out/ensemble.labeled.v2.jsonl --bins 8 --field finalConfidence
 """
-import argparse, json, math
+import argparse, math, os, sys
 from typing import List, Dict
 
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from core.iojsonl import read_jsonl as iter_jsonl, write_json_stdout
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
 
 def main():
     ap = argparse.ArgumentParser()
@@ -32,7 +31,7 @@ def main():
     # Load records
     records = list(iter_jsonl(args.inp))
     if not records:
-        print(json.dumps({'error':'no_records'}))
+        write_json_stdout({'error':'no_records'})
         return
 
     # Build confidence list
@@ -48,23 +47,21 @@ def main():
         vals.append(v)
 
     if not vals:
-        print(json.dumps({'error':'no_confidence_values'}))
+        write_json_stdout({'error':'no_confidence_values'})
         return
 
     bins = args.bins
-    bucket = [[] for _ in range(bins)]
-    for v in vals:
-        idx = min(bins-1, int(v * bins))
-        bucket[idx].append(v)
+    vals_np = np.asarray(vals, dtype=np.float64)
+    idx = np.clip((vals_np * bins).astype(np.int64), 0, bins-1)
+    counts = np.bincount(idx, minlength=bins).tolist()
+    sums = np.bincount(idx, weights=vals_np, minlength=bins).tolist()
 
     summary = []
-    for i, b in enumerate(bucket):
-        if not b:
-            summary.append({'bin': i, 'count':0, 'range': [i/bins, (i+1)/bins], 'avg': None})
-        else:
-            summary.append({'bin': i, 'count':len(b), 'range':[i/bins, (i+1)/bins], 'avg': sum(b)/len(b)})
+    for i in range(bins):
+        c = counts[i]
+        summary.append({'bin': i, 'count': c, 'range': [i/bins, (i+1)/bins], 'avg': sums[i]/c if c else None})
 
-    print(json.dumps({'field': args.field, 'records': len(records), 'bins': summary}, indent=2))
+    write_json_stdout({'field': args.field, 'records': len(records), 'bins': summary}, indent=True)
 
 if __name__ == '__main__':
     main()
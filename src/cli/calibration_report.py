@@ -12,12 +12,15 @@ import argparse, json, sys, os, math
 from pathlib import Path
 from typing import List, Dict
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
 from insights.backends import load_backend, LABELS
+from core.iojsonl import read_jsonl as iter_jsonl, write_json_stdout
 
 
 def build_parser():
@@ -29,17 +32,6 @@ def build_parser():
     return p
 
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip();
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-
 def load_labeled(path: str):
     texts=[]; labels=[]
     for obj in iter_jsonl(path):
@@ -49,43 +41,56 @@ def load_labeled(path: str):
     return texts, labels
 
 
+def temperature_scale_matrix(P: np.ndarray, T: float) -> np.ndarray:
+    """Temperature-scale an (N, K) probability matrix (returned as-is when T == 1)."""
+    if abs(T-1.0) < 1e-6 or not len(P):
+        return P
+    # Clipped logits / T, then a row-wise max-shifted softmax
+    P = np.clip(P, 1e-12, 1-1e-12)
+    Z = (np.log(P) - np.log1p(-P)) / T
+    Z -= Z.max(axis=1, keepdims=True)
+    E = np.exp(Z)
+    E /= E.sum(axis=1, keepdims=True)
+    return E
+
+
+def temperature_matrix(probs_list: List[Dict[str,float]], T: float):
+    """Return ``(labels, P)``: the probs as an (N, K) array, temperature-scaled unless T == 1."""
+    labs = list(probs_list[0].keys()) if probs_list else []
+    P = np.array([[row[l] for l in labs] for row in probs_list], dtype=np.float64).reshape(len(probs_list), len(labs))
+    return labs, temperature_scale_matrix(P, T)
+
+
 def apply_temperature(probs_list: List[Dict[str,float]], T: float):
-    if abs(T-1.0) < 1e-6:
+    if abs(T-1.0) < 1e-6 or not probs_list:
         return probs_list
-    out=[]
-    import math as _m
-    for row in probs_list:
-        labs=list(row.keys())
-        eps=1e-12
-        vals=[min(max(row[l],eps),1-eps) for l in labs]
-        logits=[_m.log(v)-_m.log(1-v) for v in vals]
-        scaled=[lg/T for lg in logits]
-        m=max(scaled); exps=[_m.exp(s-m) for s in scaled]; z=sum(exps) or 1.0
-        out.append({labs[i]: exps[i]/z for i in range(len(labs))})
-    return out
-
-
-def compute_ece(pred_labels: List[str], probs: List[Dict[str,float]], true_labels: List[str], bins: int):
-    # Using max-prob bucket ECE
+    labs, E = temperature_matrix(probs_list, T)
+    return [dict(zip(labs, row)) for row in E.tolist()]
+
+
+def compute_ece(pred_labels: List[str], probs: List[Dict[str,float]] | np.ndarray, true_labels: List[str], bins: int):
+    # Using max-prob bucket ECE; per-bin sums via bincount instead of a Python loop
     assert len(pred_labels)==len(true_labels)==len(probs)
     n=len(pred_labels)
-    bucket_tot=[0]*bins; bucket_correct=[0]*bins; bucket_conf=[0.0]*bins
-    for pl, tl, pr in zip(pred_labels, true_labels, probs):
-        max_p = max(pr.values())
-        b = min(bins-1, int(max_p * bins))
-        bucket_tot[b]+=1
-        bucket_conf[b]+=max_p
-        bucket_correct[b]+=1 if pl==tl else 0
-    ece=0.0
+    if isinstance(probs, np.ndarray):  # (N, K) matrix from temperature_matrix
+        max_p = probs.max(axis=1) if n else np.zeros(0)
+    else:
+        max_p = np.fromiter((max(pr.values()) for pr in probs), dtype=np.float64, count=n)
+    correct = np.fromiter((pl==tl for pl, tl in zip(pred_labels, true_labels)), dtype=np.float64, count=n)
+    idx = np.minimum(bins-1, (max_p * bins).astype(np.int64))
+    bucket_tot = np.bincount(idx, minlength=bins)
+    bucket_conf = np.bincount(idx, weights=max_p, minlength=bins)
+    bucket_correct = np.bincount(idx, weights=correct, minlength=bins)
+    # sum_b (m_b/n)*|acc_b-conf_b| == sum_b |correct_b-conf_b| / n
+    ece = float(np.abs(bucket_correct - bucket_conf).sum() / n) if n else 0.0
     bin_data=[]
-    for i in range(bins):
-        if bucket_tot[i]==0:
+    for i, tot in enumerate(bucket_tot.tolist()):
+        if tot==0:
             bin_data.append({'bin':i,'count':0,'confidence':None,'accuracy':None})
             continue
-        acc = bucket_correct[i]/bucket_tot[i]
-        conf = bucket_conf[i]/bucket_tot[i]
-        ece += (bucket_tot[i]/n) * abs(acc-conf)
-        bin_data.append({'bin':i,'count':bucket_tot[i],'confidence':round(conf,3),'accuracy':round(acc,3)})
+        acc = bucket_correct[i]/tot
+        conf = bucket_conf[i]/tot
+        bin_data.append({'bin':i,'count':tot,'confidence':round(float(conf),3),'accuracy':round(float(acc),3)})
     return round(ece,4), bin_data
 
 
@@ -95,7 +100,9 @@ def main(argv=None):
     if not texts:
         print('No labeled data loaded', file=sys.stderr); sys.exit(1)
     model = load_backend(args.modelDir)
-    probs = model.predict_proba(texts)
+    # (N, K) straight from the backend: no per-row prob dicts on this path
+    probs = np.asarray(model.predict_proba_matrix(texts), dtype=np.float64)
+    labs = list(model.labels)
     # Apply temperature if calibration.json present
     calib_path = Path(args.modelDir)/'calibration.json'
     temperature = 1.0
@@ -105,10 +112,10 @@ def main(argv=None):
             temperature = float(c.get('temperature',1.0))
         except Exception:
             pass
-    calibrated_probs = apply_temperature(probs, temperature)
-    # Predictions post calibration
-    pred_labels = [max(p.items(), key=lambda kv: kv[1])[0] for p in calibrated_probs]
-    ece, bins_data = compute_ece(pred_labels, calibrated_probs, labels, args.bins)
+    calibrated = temperature_scale_matrix(probs, temperature)
+    # Predictions post calibration: argmax over the same matrix ECE bins on
+    pred_labels = [labs[i] for i in calibrated.argmax(axis=1).tolist()]
+    ece, bins_data = compute_ece(pred_labels, calibrated, labels, args.bins)
     report = {
         'samples': len(texts),
         'bins': args.bins,
@@ -117,7 +124,7 @@ def main(argv=None):
         'bins_data': bins_data
     }
     Path(args.out).write_text(json.dumps(report, indent=2), encoding='utf-8')
-    print(json.dumps({'ece': ece, 'written': args.out}, indent=2))
+    write_json_stdout({'ece': ece, 'written': args.out}, indent=True)
 
 if __name__ == '__main__':  # pragma: no cover
     main()
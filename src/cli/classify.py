@@ -8,28 +8,68 @@ Optionally includes debug fields when pipeline config debug=True.
 Supports an optional JSON config file whose keys map onto PipelineConfig
 dataclass fields; CLI flags override config file values.
 """
-import argparse, json, sys
+import argparse, json, os, sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 from datetime import datetime
-import platform, hashlib
+import platform, hashlib, mmap
+from typing import Iterable, Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from insights.classifier_pipeline import ClassifierPipeline, PipelineConfig
+from insights.classifier_pipeline import PipelineConfig, get_pipeline
+from core.iojsonl import dumps_line, read_jsonl_texts, write_json_stdout
 
 
-def iter_jsonl(path: str):
-    with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
+# Below this many texts a process pool costs more to start than it saves.
+_PROCESS_POOL_MIN = 64
+_CHUNK = 64
+_worker_pipe = None
+
+
+def _init_worker(cfg: PipelineConfig, model_path: str | None):
+    global _worker_pipe
+    _worker_pipe = get_pipeline(cfg, self_train_model_path=model_path)
+
+
+def _classify_chunk(texts: list[str]):
+    return _worker_pipe.classify_texts(texts)
+
+
+def _chunks(texts: Iterator[str]) -> Iterator[list[str]]:
+    while chunk := list(islice(texts, _CHUNK)):
+        yield chunk
+
+
+def classify_stream(cfg: PipelineConfig, model_path: str | None, texts: Iterable[str], workers: int):
+    """Yield classified records in input order.
+
+    ``texts`` is consumed lazily, ``_CHUNK`` at a time. Heuristic and
+    self-train scoring are pure Python and stateless per text, so large inputs
+    are fanned out over worker processes, each holding its own pipeline, with
+    at most two chunks per worker in flight. Zero-shot stays in-process: the
+    NLI model is too heavy to load once per worker.
+    """
+    texts = iter(texts)
+    head = list(islice(texts, _PROCESS_POOL_MIN))
+    chunks = _chunks(chain(head, texts))
+    if workers <= 1 or cfg.enable_zero_shot or len(head) < _PROCESS_POOL_MIN:
+        pipe = get_pipeline(cfg, self_train_model_path=model_path)
+        for chunk in chunks:
+            yield from pipe.classify_texts(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cfg, model_path)) as ex:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(ex.submit(_classify_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
 
 def load_config(path: Path) -> dict:
@@ -39,7 +79,7 @@ def load_config(path: Path) -> dict:
         raise SystemExit(f"Failed to load config {path}: {e}")
 
 
-def main():
+def main(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument('--in', dest='inp', required=True, help='Input enriched insights JSONL')
     ap.add_argument('--out', dest='out', required=True, help='Output classified JSONL')
@@ -58,7 +98,8 @@ def main():
     ap.add_argument('--conflict-dampener', type=float, default=None, help='Confidence subtraction amount (default 0.05)')
     ap.add_argument('--enable-provisional-risk', action='store_true', help='Add provisionalLabel=Risk in strong risk heuristic cases downgraded to Neutral')
     ap.add_argument('--debug', action='store_true')
-    args = ap.parse_args()
+    ap.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Classification worker processes (1 = sequential)')
+    args = ap.parse_args(argv)
 
     base_cfg = {}
     if args.config:
@@ -94,23 +135,18 @@ def main():
     valid_fields = set(PipelineConfig.__dataclass_fields__.keys())
     cfg_kwargs = {k: v for k, v in base_cfg.items() if k in valid_fields}
     cfg = PipelineConfig(**cfg_kwargs)
-    pipe = ClassifierPipeline(cfg, self_train_model_path=args.model)
 
     count = 0
     first_pipeline_record_meta = None
-    with open(args.out, 'w', encoding='utf-8') as w:
-        for rec in iter_jsonl(args.inp):
-            text = rec.get('text')
-            if not text:
-                continue
-            out_rec = pipe.classify_text(text)
+    with open(args.out, 'wb', buffering=1 << 20) as w:
+        for out_rec in classify_stream(cfg, args.model, read_jsonl_texts(args.inp), args.workers):
             if first_pipeline_record_meta is None:
                 first_pipeline_record_meta = {
                     'schemaVersion': out_rec.get('schemaVersion'),
                     'taxonomyVersion': out_rec.get('taxonomyVersion'),
                     'tagVocabularyVersion': out_rec.get('tagVocabularyVersion')
                 }
-            w.write(json.dumps(out_rec, ensure_ascii=False) + '\n')
+            w.write(dumps_line(out_rec))
             count += 1
     manifest = {
         'timestamp': datetime.utcnow().isoformat() + 'Z',
@@ -124,17 +160,24 @@ def main():
         'platform': platform.platform(),
         'command': ' '.join(sys.argv),
     }
-    # Quick integrity hash of output file content size + first 1KB
+    # Integrity: size, hash of the first 1KB and of the whole file. The full
+    # hash runs over an mmap of the file, so it is never copied into memory.
     try:
-        p = Path(args.out)
-        data_head = p.read_bytes()[:1024]
-        manifest['outputSizeBytes'] = p.stat().st_size
+        with open(args.out, 'rb') as f:
+            data_head = f.read(1024)
+            size = os.fstat(f.fileno()).st_size
+            full = hashlib.sha256()
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    full.update(mm)
+        manifest['outputSizeBytes'] = size
         manifest['outputHeadHash'] = hashlib.sha256(data_head).hexdigest()
+        manifest['outputSha256'] = full.hexdigest()
     except Exception:
         pass
     manifest_path = Path(args.out).with_name('run_manifest.json')
     manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
-    print(json.dumps({'processed': count, 'out': args.out, 'manifest': str(manifest_path)}))
+    write_json_stdout({'processed': count, 'out': args.out, 'manifest': str(manifest_path)})
 
 
 if __name__ == '__main__':  # pragma: no cover
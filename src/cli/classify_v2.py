@@ -11,11 +11,30 @@ Usage:
 import argparse, json, sys
 from pathlib import Path
 
+try:  # optional fast JSON (pip install tribute-pipeline[fast]); stdlib fallback
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if orjson is not None:
+    def _dumps_record(text: str, out: dict) -> bytes:
+        return orjson.dumps({'text': text, **out}, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+else:
+    # SimpleClassifier output has a fixed shape, so only the values go through
+    # the encoder; keys and punctuation are baked into the template.
+    _RECORD = '{"text":%s,"label":%s,"labelTag":%s,"rationale":%s,"confidence":%s}\n'
+    _encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def _dumps_record(text: str, out: dict) -> bytes:
+        return (_RECORD % (_encode(text), _encode(out['label']), _encode(out['labelTag']),
+                           _encode(out['rationale']), _encode(out['confidence']))).encode('utf-8')
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from insights.simple_classifier import SimpleClassifier
+from core.iojsonl import read_jsonl_texts, write_json_stdout
 import warnings as _warnings
 _warnings.warn(
     'cli.classify_v2 is deprecated; please use cli.classify (unified pipeline) instead.',
@@ -24,17 +43,6 @@ _warnings.warn(
 )
 
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
-
-
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--in', dest='inp', required=True, help='Input enriched insights JSONL')
@@ -45,19 +53,13 @@ def main():
 
     clf = SimpleClassifier(self_train_model_path=args.model, strong_threshold=args.strongThreshold)
     count = 0
-    with open(args.out,'w',encoding='utf-8') as w:
-        for rec in iter_jsonl(args.inp):
-            txt = rec.get('text')
-            if not txt:
-                continue
+    with open(args.out, 'wb', buffering=1 << 20) as w:
+        for txt in read_jsonl_texts(args.inp):
             out = clf.classify(txt)
             # ensure required fields retained
-            w.write(json.dumps({
-                'text': txt,
-                **out
-            }, ensure_ascii=False) + '\n')
+            w.write(_dumps_record(txt, out))
             count += 1
-    print(json.dumps({'processed': count, 'out': args.out}))
+    write_json_stdout({'processed': count, 'out': args.out})
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -10,46 +10,57 @@ Usage:
   python src/cli/diagnose_insights.py --in data/eigenlayer.insights.jsonl
   python src/cli/diagnose_insights.py --in data/eigenlayer.insights.jsonl --detailOut out/diagnose.tsv
 """
-import argparse, json, os, sys, statistics, math
-from collections import Counter, defaultdict
+import argparse, os, re, sys, math
+from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
 from core.insight_extract import infer_candidate_type, compute_quality, NUMBER_PATTERN, CRYPTO_KEYWORDS
+from core.iojsonl import read_jsonl as iter_jsonl, write_json_stdout
 
+# Same substrings the lowered-text scan looked for (no word boundaries, so
+# "risky" / "slashed" still count), matched case-insensitively in one pass.
+RISKISH_RE = re.compile(r'risk|slash|penalt(?:y|ies)|attack|exploit', re.IGNORECASE)
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+
+QUALITY_BUCKETS = ('vlow', 'low', 'mid', 'high', 'vhigh')
+QUALITY_EDGES = (0.2, 0.4, 0.6, 0.8)  # lower bound of each bucket after 'vlow'
+
+
+def quality_bucket_ids(qualities) -> np.ndarray:
+    """Index into QUALITY_BUCKETS for each score (NaN counts as 'vlow')."""
+    q = np.asarray(qualities, dtype=np.float64)
+    ids = np.digitize(q, QUALITY_EDGES)
+    ids[np.isnan(q)] = 0
+    return ids
 
 
-def quality_bucket(q: float) -> str:
-    if q >= 0.8: return 'vhigh'
-    if q >= 0.6: return 'high'
-    if q >= 0.4: return 'mid'
-    if q >= 0.2: return 'low'
-    return 'vlow'
+def ranked_counts(ids: np.ndarray, names) -> list:
+    """``(name, count)`` pairs in Counter.most_common() order: by count, ties by first occurrence."""
+    counts = np.bincount(ids, minlength=len(names)).tolist()
+    present, first = np.unique(ids, return_index=True)
+    order = sorted(zip(present.tolist(), first.tolist()), key=lambda t: (-counts[t[0]], t[1]))
+    return [(names[i], counts[i]) for i, _ in order]
 
 
 def summarize(path: str):
-    ct_counter = Counter()
-    qb_counter = Counter()
+    # Per-record values go into flat lists; counting happens once, vectorized
+    ct_ids = []
+    ct_index = {}
+    qualities = []
     length_chars = []
     length_tokens = []
     riskish = 0
     numeric = 0
     total = 0
     examples_per_type = defaultdict(list)
+    saturated = set()  # types that already have their 3 examples
     for obj in iter_jsonl(path):
         text = obj.get('text')
         if not text: continue
@@ -70,32 +81,42 @@ def summarize(path: str):
             q = float(q)
         except Exception:
             q = 0.0
-        qb = quality_bucket(q)
-        ct_counter[ctype] += 1
-        qb_counter[qb] += 1
+        ct_ids.append(ct_index.setdefault(ctype, len(ct_index)))
+        qualities.append(q)
         length_chars.append(len(text))
         length_tokens.append(len(text.split()))
-        low = text.lower()
-        if any(w in low for w in ('risk','slash','slashing','penalty','penalties','attack','exploit')):
+        if RISKISH_RE.search(text):
             riskish += 1
         if NUMBER_PATTERN.search(text):
             numeric += 1
-        if len(examples_per_type[ctype]) < 3:
-            examples_per_type[ctype].append(text[:140])
+        if ctype not in saturated:
+            examples = examples_per_type[ctype]
+            examples.append(text[:140])
+            if len(examples) >= 3:
+                saturated.add(ctype)
     def pct(x):
         return round(100.0 * x / total,2) if total else 0.0
+    # Order statistics by selection (np.percentile / np.partition), not a full sort.
+    # p90 keeps its historical definition: the element at rank int(0.9*n)-1.
+    char_len = {'mean': 0, 'p50': 0, 'p90': 0, 'min': 0, 'max': 0}
+    if length_chars:
+        lc = np.asarray(length_chars, dtype=np.int64)
+        k90 = int(0.9*len(lc)) - 1
+        char_len = {
+            'mean': round(float(lc.mean()),2),
+            'p50': int(np.percentile(lc, 50)),
+            'p90': int(np.partition(lc, k90)[k90]),
+            'min': int(lc.min()),
+            'max': int(lc.max()),
+        }
+    ct_counts = ranked_counts(np.asarray(ct_ids, dtype=np.int64), list(ct_index)) if total else []
+    qb_counts = ranked_counts(quality_bucket_ids(qualities), QUALITY_BUCKETS) if total else []
     stats = {
         'total': total,
-        'candidateType_counts': {k:{'count':v,'pct':pct(v)} for k,v in ct_counter.most_common()},
-        'quality_bucket_counts': {k:{'count':v,'pct':pct(v)} for k,v in qb_counter.most_common()},
-        'char_len': {
-            'mean': round(statistics.mean(length_chars),2) if length_chars else 0,
-            'p50': int(statistics.median(length_chars)) if length_chars else 0,
-            'p90': int(sorted(length_chars)[int(0.9*len(length_chars))-1]) if length_chars else 0,
-            'min': min(length_chars) if length_chars else 0,
-            'max': max(length_chars) if length_chars else 0,
-        },
-        'token_len_mean': round(statistics.mean(length_tokens),2) if length_tokens else 0,
+        'candidateType_counts': {k:{'count':v,'pct':pct(v)} for k,v in ct_counts},
+        'quality_bucket_counts': {k:{'count':v,'pct':pct(v)} for k,v in qb_counts},
+        'char_len': char_len,
+        'token_len_mean': round(float(np.mean(length_tokens)),2) if length_tokens else 0,
         'riskish_pct': pct(riskish),
         'numeric_pct': pct(numeric),
         'examples_per_type': examples_per_type,
@@ -130,7 +151,7 @@ def main(argv=None):
                 for ex in examples:
                     # quality bucket unknown per-example here (skipped for brevity)
                     w.writerow([ctype,'?',ex])
-    sys.stdout.write(json.dumps(stats, indent=2, ensure_ascii=False) + '\n')
+    write_json_stdout(stats, indent=True)
 
 
 if __name__ == '__main__':  # pragma: no cover
@@ -6,7 +6,7 @@ Reads JSONL with at least 'text'. Writes enriched JSONL with final label/tag and
 Example:
   python -m cli.ensemble_classify --in data/eigenlayer.insights.enriched.jsonl --out out/ensemble.labeled.jsonl --model models/selftrain --enableZeroShot
 """
-import argparse, json, sys
+import argparse, sys
 from pathlib import Path
 import os
 
@@ -16,6 +16,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from insights.ensemble import EnsembleClassifier
+from core.iojsonl import dumps_line, read_jsonl as iter_jsonl, write_json_stdout
 import warnings as _warnings
 _warnings.warn(
     'cli.ensemble_classify is deprecated; use cli.classify with --enable-self-train/--enable-zero-shot config.',
@@ -23,16 +24,9 @@ _warnings.warn(
     stacklevel=2
 )
 
+# Serialized records are handed to the writer this many at a time
+WRITE_BATCH = 256
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
 
 def main():
     ap = argparse.ArgumentParser()
@@ -56,7 +50,8 @@ def main():
     ens = EnsembleClassifier(self_train_model_path=args.model, config=cfg)
 
     count = 0
-    with open(args.out,'w',encoding='utf-8') as w:
+    lines = []
+    with open(args.out, 'wb', buffering=1 << 20) as w:
         for rec in iter_jsonl(args.inp):
             txt = rec.get('text')
             if not txt:
@@ -78,9 +73,14 @@ def main():
                 'provenance': rec.get('provenance','scraped'),
                 'classificationProvenance': res['provenance']
             })
-            w.write(json.dumps(rec, ensure_ascii=False) + '\n')
-            count += 1
-    print(json.dumps({'processed': count, 'out': args.out}))
+            lines.append(dumps_line(rec))
+            if len(lines) >= WRITE_BATCH:
+                w.writelines(lines)
+                count += len(lines)
+                lines.clear()
+        w.writelines(lines)
+        count += len(lines)
+    write_json_stdout({'processed': count, 'out': args.out})
 
 if __name__ == '__main__':
     main()
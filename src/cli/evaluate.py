@@ -8,9 +8,12 @@ Usage:
 Outputs JSON metrics (macro F1, per-class precision/recall/F1, confusion matrix, latency stats).
 """
 import argparse, json, time, os, sys
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
@@ -18,18 +21,7 @@ if PARENT_DIR not in sys.path:
 
 from insights.backends import load_backend, LABELS
 from insights.lexicon import DEFAULT_LEXICON
-
-
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+from core.iojsonl import read_jsonl as iter_jsonl, write_json_stdout
 
 
 def load_dataset(path: str):
@@ -43,45 +35,77 @@ def load_dataset(path: str):
     return texts, labels
 
 
-def evaluate_backend(backend, texts: List[str], labels: List[str]):
-    start = time.time()
-    probs = backend.predict_proba(texts, DEFAULT_LEXICON)
-    infer_s = time.time() - start
-    preds = []
-    for p in probs:
-        preds.append(max(p.items(), key=lambda kv: kv[1])[0])
-    # confusion matrix
-    cm = {a:{b:0 for b in LABELS} for a in LABELS}
-    for gold, pred in zip(labels, preds):
-        cm[gold][pred] += 1
+def dedupe_texts(texts: List[str]):
+    """Return ``(unique_texts, inverse)`` with ``unique_texts[inverse[i]] == texts[i]`` (first-seen order)."""
+    first: Dict[str, int] = {}
+    inverse = np.fromiter((first.setdefault(t, len(first)) for t in texts), dtype=np.int64, count=len(texts))
+    return list(first), inverse
+
+
+def evaluate_backend(backend, texts: List[str], labels: List[str], batch_size: int = 256, unique=None):
+    # Only distinct texts are scored (``unique`` from dedupe_texts may be shared
+    # across backends). Chunked inference keeps one batch of prob dicts alive
+    # at a time, each collapsed to argmax label indices.
+    uniq_texts, inverse = unique if unique is not None else dedupe_texts(texts)
+    label_idx = {lab: i for i, lab in enumerate(LABELS)}
+    gold_idx = np.fromiter((label_idx[g] for g in labels), dtype=np.int64, count=len(labels))
+    uniq_pred = np.zeros(len(uniq_texts), dtype=np.int64)
+    infer_s = 0.0
+    for i in range(0, len(uniq_texts), batch_size):
+        start = time.time()
+        probs = backend.predict_proba(uniq_texts[i:i+batch_size], DEFAULT_LEXICON)
+        infer_s += time.time() - start
+        if not probs:
+            continue
+        labs = list(probs[0])  # model label order; argmax ties resolve like max() over the dict
+        P = np.array([[p[l] for l in labs] for p in probs], dtype=np.float64)
+        uniq_pred[i:i+len(probs)] = [label_idx[labs[j]] for j in np.argmax(P, axis=1).tolist()]
+    cm_np = np.zeros((len(LABELS), len(LABELS)), dtype=np.int64)
+    np.add.at(cm_np, (gold_idx, uniq_pred[inverse]), 1)
     eps = 1e-9
-    per_class = {}
-    for lab in LABELS:
-        tp = cm[lab][lab]
-        fp = sum(cm[o][lab] for o in LABELS if o!=lab)
-        fn = sum(cm[lab][o] for o in LABELS if o!=lab)
-        prec = tp/(tp+fp+eps)
-        rec = tp/(tp+fn+eps)
-        f1 = 2*prec*rec/(prec+rec+eps) if (prec+rec)>0 else 0
-        per_class[lab] = {'precision': round(prec,3), 'recall': round(rec,3), 'f1': round(f1,3)}
+    tp = np.diag(cm_np)
+    fp = cm_np.sum(axis=0) - tp
+    fn = cm_np.sum(axis=1) - tp
+    prec = tp/(tp+fp+eps)
+    rec = tp/(tp+fn+eps)
+    denom = prec + rec
+    f1 = np.where(denom > 0, 2*prec*rec/(denom+eps), 0.0)
+    per_class = {
+        lab: {'precision': round(p, 3), 'recall': round(r, 3), 'f1': round(f, 3)}
+        for lab, p, r, f in zip(LABELS, prec.tolist(), rec.tolist(), f1.tolist())
+    }
+    cm = {a: dict(zip(LABELS, row)) for a, row in zip(LABELS, cm_np.tolist())}
     macro_f1 = round(sum(v['f1'] for v in per_class.values())/len(LABELS),3)
     return {
         'macro_f1': macro_f1,
         'per_class': per_class,
         'confusion_matrix': cm,
         'samples': len(texts),
+        'unique_samples': len(uniq_texts),
         'total_seconds': round(infer_s,3),
-        'avg_ms_per_sample': round((infer_s/len(texts))*1000,3) if texts else None,
+        # Per scored (distinct) text: duplicates cost no inference time
+        'avg_ms_per_sample': round((infer_s/len(uniq_texts))*1000,3) if uniq_texts else None,
         'backend': getattr(backend,'backend_name','unknown'),
     }
 
 
+@lru_cache(maxsize=4)
+def _load_backend_cached(model_dir: str):
+    return load_backend(model_dir)
+
+
+def load_backend_once(model_dir: str):
+    """load_backend memoized per resolved path (``--compare`` may name the primary model dir)."""
+    return _load_backend_cached(os.path.realpath(model_dir))
+
+
 def build_parser():
     p = argparse.ArgumentParser(description='Evaluate trained backend on labeled data.')
     p.add_argument('--data', required=True, help='Labeled JSONL (text,label)')
     p.add_argument('--modelDir', required=True, help='Primary model directory')
     p.add_argument('--compare', help='Optional second model directory to compare')
     p.add_argument('--out', help='Write metrics JSON to file (else stdout)')
+    p.add_argument('--batchSize', type=int, default=256, help='Texts per predict_proba call')
     return p
 
 
@@ -91,18 +115,19 @@ def main(argv=None):
     if not texts:
         print('No valid labeled examples', file=sys.stderr)
         sys.exit(1)
-    primary = load_backend(args.modelDir)
-    primary_metrics = evaluate_backend(primary, texts, labels)
+    unique = dedupe_texts(texts)
+    primary = load_backend_once(args.modelDir)
+    primary_metrics = evaluate_backend(primary, texts, labels, args.batchSize, unique)
     result = {'primary': primary_metrics}
     if args.compare:
-        comp = load_backend(args.compare)
-        comp_metrics = evaluate_backend(comp, texts, labels)
+        comp = load_backend_once(args.compare)
+        # Same resolved model dir: identical predictions, reuse the metrics
+        comp_metrics = primary_metrics if comp is primary else evaluate_backend(comp, texts, labels, args.batchSize, unique)
         result['compare'] = comp_metrics
-    out_json = json.dumps(result, indent=2)
     if args.out:
-        Path(args.out).write_text(out_json, encoding='utf-8')
+        Path(args.out).write_text(json.dumps(result, indent=2), encoding='utf-8')
     else:
-        print(out_json)
+        write_json_stdout(result, indent=True)
 
 if __name__ == '__main__':  # pragma: no cover
     main()
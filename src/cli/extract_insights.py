@@ -1,4 +1,4 @@
-import argparse, json, importlib, sys, os
+import argparse, json, sys, os
 
 # Ensure parent directory (containing package 'insights') is on sys.path ahead of this script's directory
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -6,15 +6,11 @@ PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
-try:
-    extract_insights = importlib.import_module('insights').extract_insights  # type: ignore[attr-defined]
-except Exception as e:
-    sys.stderr.write(f"Failed to import insights package: {e}\n")
-    raise
+from cli import print_version_if_requested
 
 def build_parser():
     p = argparse.ArgumentParser(description="Phase 2: Extract raw atomic insights (no classification) from scraped pages.")
-    p.add_argument("--pages", required=True, help="Path to scraped_pages.jsonl produced by scrape phase")
+    p.add_argument("--pages", required=True, help="Path to scraped_pages.jsonl produced by scrape phase ('-' reads pages from stdin, e.g. piped from scrape --echo)")
     p.add_argument("--out", required=True, help="Path to write insights_raw.jsonl")
     p.add_argument("--maxInsights", type=int, default=100, help="Maximum insights to emit (cap)")
     p.add_argument("--minInsights", type=int, default=50, help="Advisory lower bound (not strictly enforced)")
@@ -27,7 +23,16 @@ def build_parser():
     return p
 
 def main(argv=None):
+    if print_version_if_requested(argv):
+        return
     args = build_parser().parse_args(argv)
+    # Imported only once arguments are valid: --help and usage errors never pay
+    # for loading the insights package and its dependencies.
+    try:
+        from insights import extract_insights
+    except Exception as e:
+        sys.stderr.write(f"Failed to import insights package: {e}\n")
+        raise
     stats = extract_insights(
         scraped_path=args.pages,
         out_path=args.out,
@@ -11,23 +11,32 @@ Inputs:
   --benchmark: Optional JSON or JSONL containing latency metrics (ms per insight) per mode.
   --outDir: directory to write classification_metrics.md and examples.md
 
-This is a lightweight utility; for large corpora prefer streaming evaluation.
+Predictions are streamed: only confusion counts and the example rows are kept in memory.
 """
-import argparse, json, os, sys, statistics, math
+import argparse, heapq, json, os, sys, statistics, math
 from pathlib import Path
 from typing import Dict, List
 
+import numpy as np
+
+try:  # optional fast JSON (pip install tribute-pipeline[fast]); stdlib fallback
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover
+    _loads = json.loads  # also accepts bytes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from cli import print_version_if_requested
+from core.iojsonl import read_jsonl as iter_jsonl
+
 LABELS = ["Advantage","Risk","Neutral"]
+LABEL_INDEX = {l: i for i, l in enumerate(LABELS)}
+# Confusion cells are folded into the counts with one bincount per this many predictions
+_CELL_FLUSH = 1 << 16
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
 
 def load_truth(path: str) -> Dict[str,str]:
     m = {}
@@ -37,25 +46,65 @@ def load_truth(path: str) -> Dict[str,str]:
             m[t] = l
     return m
 
-def evaluate(pred_path: str, truth_map: Dict[str,str]):
-    preds = list(iter_jsonl(pred_path))
-    cm = {a:{b:0 for b in LABELS} for a in LABELS}
-    for p in preds:
-        t = truth_map.get(p.get('text'))
+def _offer(heap: list, k: int, item) -> None:
+    if len(heap) < k:
+        heapq.heappush(heap, item)
+    else:
+        heapq.heappushpop(heap, item)
+
+
+def evaluate_stream(pred_path: str, truth_map: Dict[str,str], examples: int = 10):
+    """Score predictions and pick example rows in one pass over ``pred_path``.
+
+    Returns ``(count, metrics, high, low)``. Only the confusion counts and two
+    heaps of ``examples`` rows are kept, never the prediction list itself;
+    ``high`` / ``low`` come out in the order the full sorts would give them
+    (confidence, then file order on ties).
+    """
+    k = len(LABELS)
+    # Truth label folded into a row offset once, so each prediction is one probe + one add
+    row_of = {t: LABEL_INDEX[l]*k for t, l in truth_map.items() if l in LABELS}
+    lookup = row_of.get
+    cm_np = np.zeros(k*k, dtype=np.int64)
+    cells = []
+    # Heap keys carry -index so that on equal confidence the later row is evicted first
+    high, low = [], []
+    count = 0
+    for idx, p in enumerate(iter_jsonl(pred_path)):
+        count += 1
+        c = p.get('confidence',0)
+        if c >= 0.75:
+            _offer(high, examples, (c, -idx, p))
+        elif 0.3 <= c <= 0.55:
+            _offer(low, examples, (-c, -idx, p))
         pl = p.get('label')
-        if t in LABELS and pl in LABELS:
-            cm[t][pl]+=1
-    metrics = {}
+        if pl not in LABELS:  # no truth lookup for predictions that can never count
+            continue
+        row = lookup(p.get('text'))
+        if row is not None:
+            cells.append(row + LABEL_INDEX[pl])
+            if len(cells) >= _CELL_FLUSH:
+                cm_np += np.bincount(np.array(cells, dtype=np.int64), minlength=k*k)
+                cells.clear()
+    if cells:
+        cm_np += np.bincount(np.array(cells, dtype=np.int64), minlength=k*k)
+    cm_np = cm_np.reshape(k, k)
     eps=1e-9
-    for lab in LABELS:
-        tp = cm[lab][lab]
-        fp = sum(cm[o][lab] for o in LABELS if o!=lab)
-        fn = sum(cm[lab][o] for o in LABELS if o!=lab)
-        prec = tp/(tp+fp+eps); rec = tp/(tp+fn+eps)
-        f1 = 2*prec*rec/(prec+rec+eps) if (prec+rec)>0 else 0
-        metrics[lab] = {'precision': round(prec,3),'recall': round(rec,3),'f1': round(f1,3)}
+    tp = np.diag(cm_np)
+    fp = cm_np.sum(axis=0) - tp
+    fn = cm_np.sum(axis=1) - tp
+    prec = tp/(tp+fp+eps); rec = tp/(tp+fn+eps)
+    denom = prec + rec
+    f1 = 2*prec*rec/(denom+eps)
+    metrics = {
+        lab: {'precision': round(pr,3),'recall': round(rc,3),'f1': round(f,3) if d>0 else 0}
+        for lab, pr, rc, f, d in zip(LABELS, prec.tolist(), rec.tolist(), f1.tolist(), denom.tolist())
+    }
+    cm = {a: dict(zip(LABELS, row)) for a, row in zip(LABELS, cm_np.tolist())}
     macro_f1 = round(sum(m['f1'] for m in metrics.values())/len(LABELS),3)
-    return preds, {'confusion_matrix': cm, 'per_class': metrics, 'macro_f1': macro_f1}
+    high = [e[2] for e in sorted(high, reverse=True)]
+    low = [e[2] for e in sorted(low, reverse=True)]
+    return count, {'confusion_matrix': cm, 'per_class': metrics, 'macro_f1': macro_f1}, high, low
 
 def cost_estimate(latency_ms: float, cost_per_second: float, count: int):
     seconds = (latency_ms/1000.0)*count
@@ -85,9 +134,7 @@ def write_metrics_md(path: Path, evaluation: Dict, benchmark: Dict|None, cost_pe
                 w.write(f"|{mode}|{round(ms,3)}|${cost:.4f}|\n")
         w.write('\n_This report is auto-generated._\n')
 
-def write_examples(preds: List[Dict], path: Path):
-    high = sorted([p for p in preds if p.get('confidence',0)>=0.75], key=lambda x: -x.get('confidence',0))[:10]
-    low = sorted([p for p in preds if 0.3 <= p.get('confidence',0) <= 0.55], key=lambda x: x.get('confidence',0))[:10]
+def write_examples(high: List[Dict], low: List[Dict], path: Path):
     with path.open('w',encoding='utf-8') as w:
         w.write('# Qualitative Examples\n\n')
         if high:
@@ -109,11 +156,11 @@ def parse_benchmark(path: str|None):
         return None
     # Support JSON or JSONL (keyed objects)
     try:
-        txt = p.read_text(encoding='utf-8').strip()
+        txt = p.read_bytes().strip()
         if not txt:
             return None
-        if txt.startswith('{'):
-            return json.loads(txt)
+        if txt.startswith(b'{'):
+            return _loads(txt)
         # else treat as JSONL list of records with mode
         out={}
         for obj in iter_jsonl(str(p)):
@@ -136,13 +183,15 @@ def build_parser():
 
 
 def main(argv=None):
+    if print_version_if_requested(argv):
+        return
     args = build_parser().parse_args(argv)
     truth_map = load_truth(args.truth)
-    preds, eval_metrics = evaluate(args.predictions, truth_map)
+    count, eval_metrics, high, low = evaluate_stream(args.predictions, truth_map)
     bench = parse_benchmark(args.benchmark)
     out_dir = Path(args.outDir); out_dir.mkdir(parents=True, exist_ok=True)
-    write_metrics_md(out_dir / 'classification_metrics.md', eval_metrics, bench, args.costPerSecond, len(preds))
-    write_examples(preds, out_dir / 'examples.md')
+    write_metrics_md(out_dir / 'classification_metrics.md', eval_metrics, bench, args.costPerSecond, count)
+    write_examples(high, low, out_dir / 'examples.md')
     print(json.dumps({'written': str(out_dir), 'macro_f1': eval_metrics['macro_f1']}, indent=2))
 
 if __name__ == '__main__':  # pragma: no cover
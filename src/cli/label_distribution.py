@@ -8,35 +8,35 @@ If multiple files provided, per-file counts + overall percentages are shown.
 
 Outputs JSON summary to stdout; optional Markdown table.
 """
-import argparse, json, sys, os, collections
+import argparse, json, sys, os, collections, itertools
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from core.iojsonl import read_jsonl as iter_jsonl
+
+COUNT_BATCH = 1 << 16  # records per Counter.update call
+# Below this much input, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 8 << 20
+
 
 def count_file(path: str):
     ctr = collections.Counter()
-    total = 0
-    for obj in iter_jsonl(path):
-        lab = obj.get('label')
-        txt = obj.get('text')
-        if not lab or not txt:
-            continue
-        ctr[lab] += 1
-        total += 1
-    return total, ctr
+    records = iter_jsonl(path)
+    # Counter.update on a list counts in C; labels keep first-seen order as before
+    while batch := list(itertools.islice(records, COUNT_BATCH)):
+        ctr.update([lab for obj in batch if (lab := obj.get('label')) and obj.get('text')])
+    return sum(ctr.values()), ctr
 
 def build_parser():
     p = argparse.ArgumentParser(description='Summarize label distributions.')
     p.add_argument('--files', nargs='+', required=True, help='One or more labeled JSONL files.')
     p.add_argument('--markdown', help='Optional markdown output path')
+    p.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes, one file each (1 = sequential; small inputs always run in-process)')
     return p
 
 def main(argv=None):
@@ -44,8 +44,13 @@ def main(argv=None):
     overall = collections.Counter()
     file_summaries = []
     grand_total = 0
-    for f in args.files:
-        total, ctr = count_file(f)
+    workers = min(args.workers, len(args.files))
+    if workers > 1 and sum(os.path.getsize(f) for f in args.files) >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(count_file, args.files))
+    else:
+        results = map(count_file, args.files)
+    for f, (total, ctr) in zip(args.files, results):
         grand_total += total
         overall.update(ctr)
         file_summaries.append({'file': f, 'total': total, 'counts': dict(ctr)})
@@ -15,7 +15,7 @@ Example:
 
 Assumes labeled JSONL for splits with fields text,label.
 """
-import argparse, json, subprocess, sys, os, shutil
+import argparse, contextlib, io, json, sys, os, shutil
 from pathlib import Path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -23,7 +23,7 @@ PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
-from insights.backends import LABELS  # noqa
+from cli import print_version_if_requested
 
 
 def build_parser():
@@ -51,19 +51,36 @@ def build_parser():
     return p
 
 
-def run_cmd(cmd: list[str]):
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise SystemExit(f'Command failed: {cmd}\nSTDERR:\n{proc.stderr}')
-    return proc.stdout.strip()
+def run_step(main, argv: list[str]) -> str:
+    """Call a CLI ``main(argv)`` in this process and return what it printed.
+
+    Steps share one interpreter, so sklearn/torch and the model code are
+    imported once for the whole run instead of once per step.
+    """
+    buf = io.StringIO()
+    prog = sys.argv[0]
+    sys.argv[0] = main.__module__.rpartition('.')[2] + '.py'  # argparse usage/errors name the step
+    try:
+        with contextlib.redirect_stdout(buf):
+            main(argv)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            detail = e.code if isinstance(e.code, str) else f'exit status {e.code}'
+            out = buf.getvalue().strip()
+            if out:  # stderr already went to the terminal; keep whatever the step printed too
+                detail += f'\nSTDOUT:\n{out}'
+            raise SystemExit(f'Step failed: {main.__module__} {argv}\n{detail}')
+    finally:
+        sys.argv[0] = prog
+    return buf.getvalue().strip()
 
 
 def ensure_model(args):
     model_path = Path(args.modelDir) / 'model.joblib'
     if model_path.exists():
         return 'existing'
-    cmd = [sys.executable, 'src/cli/train_classifier.py',
-           '--trainFile', args.train, '--devFile', args.dev, '--testFile', args.test,
+    from cli import train_classifier
+    cmd = ['--trainFile', args.train, '--devFile', args.dev, '--testFile', args.test,
            '--backend', args.backend, '--outDir', args.modelDir]
     if args.calibrate:
         cmd.append('--calibrate')
@@ -75,32 +92,36 @@ def ensure_model(args):
         cmd += ['--maxFeatures', str(args.maxFeatures)]
     elif args.backend == 'hashing':
         cmd += ['--hashFeatures', str(args.hashFeatures)]
-    out = run_cmd(cmd)
+    out = run_step(train_classifier.main, cmd)
     return out
 
 
 def classify_test(args, classified_path: Path):
-    cmd = [sys.executable, 'src/cli/classify.py', '--in', args.test, '--out', str(classified_path), '--mode', args.mode, '--modelDir', args.modelDir, '--eval', '--truth', args.test, '--metrics', '--hybridRiskThreshold', str(args.hybridRiskThreshold), '--hybridAdvThreshold', str(args.hybridAdvThreshold)]
-    out = run_cmd(cmd)
+    from cli import classify
+    cmd = ['--in', args.test, '--out', str(classified_path), '--mode', args.mode, '--modelDir', args.modelDir, '--eval', '--truth', args.test, '--metrics', '--hybridRiskThreshold', str(args.hybridRiskThreshold), '--hybridAdvThreshold', str(args.hybridAdvThreshold)]
+    out = run_step(classify.main, cmd)
     return out
 
 
 def benchmark(args, benchmark_path: Path):
-    cmd = [sys.executable, 'src/cli/benchmark_classify.py', '--inputs', args.test, '--modelDir', args.modelDir, '--truth', args.test, '--repeats', '2']
-    out = run_cmd(cmd)
-    benchmark_path.write_text(out, encoding='utf-8')
-    return out
+    from cli import benchmark_classify
+    cmd = ['--inputs', args.test, '--modelDir', args.modelDir, '--truth', args.test, '--repeats', '2', '--out', str(benchmark_path)]
+    run_step(benchmark_classify.main, cmd)
+    return benchmark_path.read_text(encoding='utf-8')
 
 
 def generate_reports(args, classified_path: Path, benchmark_path: Path|None):
-    cmd = [sys.executable, 'src/cli/generate_reports.py', '--predictions', str(classified_path), '--truth', args.test, '--outDir', args.reportsDir, '--costPerSecond', str(args.costPerSecond)]
+    from cli import generate_reports as gen_reports
+    cmd = ['--predictions', str(classified_path), '--truth', args.test, '--outDir', args.reportsDir, '--costPerSecond', str(args.costPerSecond)]
     if benchmark_path and benchmark_path.exists():
         cmd += ['--benchmark', str(benchmark_path)]
-    out = run_cmd(cmd)
+    out = run_step(gen_reports.main, cmd)
     return out
 
 
 def main(argv=None):
+    if print_version_if_requested(argv):
+        return
     args = build_parser().parse_args(argv)
     Path(args.reportsDir).mkdir(parents=True, exist_ok=True)
     model_status = ensure_model(args)
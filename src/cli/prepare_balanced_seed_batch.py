@@ -12,55 +12,75 @@ Usage:
   python src/cli/prepare_balanced_seed_batch.py --in data/eigenlayer.insights.jsonl \
       --out data/seed_batch_balanced.v1.jsonl --total 60 --minPerType 5 --seed 42
 """
-import argparse, json, random, os, sys
-from collections import defaultdict, deque
+import argparse, json, math, random, os, sys
 from typing import Dict, List
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
+from core.iojsonl import dumps_line, load_spans, read_jsonl_spans
+
 QUALITY_ORDER = ['high','mid','low']  # preference order when filling
+QUALITY_CODE = {qb: i for i, qb in enumerate(QUALITY_ORDER)}
+QUALITY_EDGES = (0.45, 0.75)  # lower bound of 'mid' and 'high'
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
 
-def quality_bucket(q: float) -> str:
-    if q is None: return 'low'
-    try: q = float(q)
-    except Exception: return 'low'
-    if q >= 0.75: return 'high'
-    if q >= 0.45: return 'mid'
-    return 'low'
+def _score(q) -> float:
+    """qualityScore as float; missing or unparsable becomes NaN (bucketed 'low')."""
+    if q is None: return math.nan
+    try: return float(q)
+    except Exception: return math.nan
+
+def quality_bucket_ids(scores) -> np.ndarray:
+    """Position in QUALITY_ORDER of each score's bucket; NaN counts as 'low'."""
+    q = np.asarray(scores, dtype=np.float64)
+    ids = (len(QUALITY_EDGES) - np.searchsorted(QUALITY_EDGES, q, side='right')).astype(np.int8)
+    ids[np.isnan(q)] = QUALITY_CODE['low']
+    return ids
 
 def load_groups(inp: str):
-    groups: Dict[str, List[Dict]] = defaultdict(list)
-    for obj in iter_jsonl(inp):
+    """Scan insights into flat arrays instead of per-group lists of dicts.
+
+    Returns ``(spans, groups, quality)``: ``spans[i]`` is the ``(start, end)``
+    byte range of record ``i`` in ``inp`` (parsed dicts are not kept; see
+    ``load_spans``), ``groups`` maps candidateType (in first-seen order) to
+    an int array of record indices in file order, and ``quality[i]`` is the
+    position of record ``i``'s bucket in QUALITY_ORDER.
+    """
+    spans: List[tuple] = []
+    type_ids: Dict[str, int] = {}
+    tcodes: List[int] = []
+    scores: List[float] = []
+    for start, end, obj in read_jsonl_spans(inp):
         text = obj.get('text')
         if not text: continue
         ctype = obj.get('candidateType','other') or 'other'
-        qbucket = quality_bucket(obj.get('qualityScore'))
-        obj['_qbucket'] = qbucket
-        groups[ctype].append(obj)
-    return groups
+        spans.append((start, end))
+        tcodes.append(type_ids.setdefault(ctype, len(type_ids)))
+        scores.append(_score(obj.get('qualityScore')))
+    tarr = np.array(tcodes, dtype=np.int64)
+    # Stable sort keeps file order inside each type
+    order = np.argsort(tarr, kind='stable')
+    bounds = np.cumsum(np.bincount(tarr, minlength=len(type_ids)))[:-1]
+    groups = dict(zip(type_ids, np.split(order, bounds)))
+    return spans, groups, quality_bucket_ids(scores)
 
-def select_balanced(groups: Dict[str,List[Dict]], total: int, min_per_type: int, seed: int):
+def select_balanced(groups: Dict[str,np.ndarray], quality: np.ndarray, total: int, min_per_type: int, seed: int):
+    """Pick record indices; shuffles go through ``random`` in the same order as
+    the record-list version, so a given seed selects the same records."""
     random.seed(seed)
     # Shuffle each group
-    for g in groups.values():
+    shuffled = {ctype: idx.tolist() for ctype, idx in groups.items()}
+    for g in shuffled.values():
         random.shuffle(g)
     selected = []
     # Step 1: guarantee min_per_type
     allocated = {}
-    for ctype, items in groups.items():
+    for ctype, items in shuffled.items():
         take = min(min_per_type, len(items))
         selected.extend(items[:take])
         allocated[ctype] = take
@@ -68,17 +88,25 @@ def select_balanced(groups: Dict[str,List[Dict]], total: int, min_per_type: int,
     remaining = total - len(selected)
     if remaining <= 0:
         return selected[:total], allocated
-    # Build quality-based queues per type
-    queues: Dict[str, Dict[str, deque]] = {}
-    for ctype, items in groups.items():
-        qbuckets = defaultdict(list)
-        for it in items[allocated.get(ctype,0):]:
-            qbuckets[it['_qbucket']].append(it)
-        # shuffle each bucket then convert to deque
-        queues[ctype] = {qb: deque(random.sample(lst, len(lst))) for qb, lst in qbuckets.items()}
+    # Quality buckets per type (first-seen bucket order), each read through a cursor
+    queues: Dict[str, Dict[int, List[int]]] = {}
+    heads: Dict[str, Dict[int, int]] = {}
+    active: Dict[str, int] = {}
+    for ctype, items in shuffled.items():
+        rest = np.array(items[allocated[ctype]:], dtype=np.int64)
+        q = quality[rest]
+        _, first = np.unique(q, return_index=True)
+        buckets = {}
+        for qb in q[np.sort(first)].tolist():
+            lst = rest[q == qb].tolist()
+            buckets[qb] = random.sample(lst, len(lst))
+        queues[ctype] = buckets
+        heads[ctype] = dict.fromkeys(buckets, 0)
+        # Bit qb set while bucket qb still has items; codes follow QUALITY_ORDER preference
+        active[ctype] = sum(1 << qb for qb, lst in buckets.items() if lst)
     # Proportional fill weights (remaining size per type)
     weights = []
-    for ctype, items in groups.items():
+    for ctype, items in shuffled.items():
         rem = max(0, len(items) - allocated[ctype])
         if rem > 0:
             weights.append((ctype, rem))
@@ -92,25 +120,23 @@ def select_balanced(groups: Dict[str,List[Dict]], total: int, min_per_type: int,
     # Round-robin through QUALITY_ORDER for each ctype appearance
     for ctype in seq:
         if remaining <= 0: break
-        bucket_map = queues.get(ctype)
-        if not bucket_map:
+        mask = active.get(ctype, 0)
+        if not mask:
             continue
-        picked = None
-        for qb in QUALITY_ORDER:
-            dq = bucket_map.get(qb)
-            if dq and dq:
-                picked = dq.popleft()
-                break
-        if picked:
-            selected.append(picked)
-            allocated[ctype] += 1
-            remaining -= 1
+        qb = (mask & -mask).bit_length() - 1  # lowest set bit = most preferred non-empty bucket
+        lst, head = queues[ctype][qb], heads[ctype]
+        selected.append(lst[head[qb]])
+        head[qb] += 1
+        if head[qb] == len(lst):
+            active[ctype] = mask & ~(1 << qb)
+        allocated[ctype] += 1
+        remaining -= 1
     # If still remaining (due to rounding), fill any leftover
     if remaining > 0:
         leftovers = []
-        for ctype, bucket_map in queues.items():
-            for dq in bucket_map.values():
-                leftovers.extend(list(dq))
+        for ctype, buckets in queues.items():
+            for qb, lst in buckets.items():
+                leftovers.extend(lst[heads[ctype][qb]:])
         random.shuffle(leftovers)
         selected.extend(leftovers[:remaining])
     return selected[:total], allocated
@@ -123,23 +149,22 @@ def main(argv=None):
     ap.add_argument('--minPerType', type=int, default=5)
     ap.add_argument('--seed', type=int, default=42)
     args = ap.parse_args(argv)
-    groups = load_groups(args.inp)
+    spans, groups, quality = load_groups(args.inp)
     if not groups:
         print('No insights found.', file=sys.stderr); sys.exit(1)
-    selected, allocated = select_balanced(groups, args.total, args.minPerType, args.seed)
+    selected, allocated = select_balanced(groups, quality, args.total, args.minPerType, args.seed)
     random.shuffle(selected)
-    with open(args.out,'w',encoding='utf-8') as w:
-        for idx, obj in enumerate(selected, start=1):
-            rec = {
-                'id': idx,
-                'text': obj.get('text'),
-                'sourceUrl': obj.get('sourceUrl'),
-                'candidateType': obj.get('candidateType','other'),
-                'qualityScore': obj.get('qualityScore'),
-                'provenance': obj.get('provenance','scraped'),
-                'sample_phase': 'seed-balanced'
-            }
-            w.write(json.dumps(rec, ensure_ascii=False) + '\n')
+    selected = load_spans(args.inp, [spans[i] for i in selected])
+    with open(args.out, 'wb', buffering=1 << 20) as w:
+        w.writelines(dumps_line({
+            'id': idx,
+            'text': obj.get('text'),
+            'sourceUrl': obj.get('sourceUrl'),
+            'candidateType': obj.get('candidateType','other'),
+            'qualityScore': obj.get('qualityScore'),
+            'provenance': obj.get('provenance','scraped'),
+            'sample_phase': 'seed-balanced'
+        }) for idx, obj in enumerate(selected, start=1))
     summary = {
         'written': len(selected),
         'allocated': allocated,
@@ -1,30 +1,29 @@
 from __future__ import annotations
 import argparse, json, random, math, os, sys
-from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
     sys.path.insert(0, PARENT_DIR)
 
+from core.iojsonl import dumps_line, load_spans, read_jsonl_spans
+
 # For now we only have un-labeled candidateType + qualityScore; we attempt a stratified sample across candidateType buckets
 
-def iter_jsonl(path: str):
-    with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
 
-def quality_bucket(q: float) -> str:
-    if q >= 0.75: return 'high'
-    if q >= 0.5: return 'mid'
-    return 'low'
+QUALITY_BUCKETS = ('low', 'mid', 'high')
+QUALITY_EDGES = (0.5, 0.75)  # lower bound of 'mid' and 'high'
+
+
+def quality_bucket_ids(scores) -> np.ndarray:
+    """Index into QUALITY_BUCKETS for each score (NaN counts as 'low')."""
+    q = np.asarray(scores, dtype=np.float64)
+    ids = np.searchsorted(QUALITY_EDGES, q, side='right')
+    ids[np.isnan(q)] = 0
+    return ids
 
 def plan_counts(total: int, groups: list[str]):
     base = total // len(groups)
@@ -38,14 +37,25 @@ def plan_counts(total: int, groups: list[str]):
 
 def sample_seed(inp: str, out: str, total: int, seed: int):
     random.seed(seed)
-    records = list(iter_jsonl(inp))
-    # group by candidateType + quality bucket, fallback 'other'
-    groups = defaultdict(list)
-    for r in records:
-        ctype = r.get('candidateType','other') or 'other'
-        qb = quality_bucket(float(r.get('qualityScore',0.0)))
-        key = f"{ctype}:{qb}"
-        groups[key].append(r)
+    # Keep only each record's byte span and the two stratification fields;
+    # the handful of records actually chosen are re-read from their spans.
+    spans, type_codes, score_list = [], [], []
+    type_ids = {}
+    for start, end, r in read_jsonl_spans(inp):
+        spans.append((start, end))
+        # group by candidateType + quality bucket, fallback 'other'
+        type_codes.append(type_ids.setdefault(f"{r.get('candidateType','other') or 'other'}", len(type_ids)))
+        score_list.append(float(r.get('qualityScore',0.0)))
+    tcodes = np.array(type_codes, dtype=np.int64)
+    cells = tcodes * len(QUALITY_BUCKETS) + quality_bucket_ids(score_list)
+    # Stable sort keeps file order inside each group
+    order = np.argsort(cells, kind='stable')
+    cell_ids, counts = np.unique(cells, return_counts=True)
+    ctypes = list(type_ids)
+    groups = {
+        f"{ctypes[c // len(QUALITY_BUCKETS)]}:{QUALITY_BUCKETS[c % len(QUALITY_BUCKETS)]}": idx.tolist()
+        for c, idx in zip(cell_ids.tolist(), np.split(order, np.cumsum(counts)[:-1]))
+    }
     group_keys = sorted(groups.keys())
     if not group_keys:
         raise SystemExit('No records found in input file.')
@@ -60,18 +70,18 @@ def sample_seed(inp: str, out: str, total: int, seed: int):
             chosen.extend(bucket[:need])
     # shuffle final order for labeling randomness
     random.shuffle(chosen)
-    with open(out,'w',encoding='utf-8') as w:
-        for idx, r in enumerate(chosen):
-            obj = {
-                'id': idx + 1,
-                'text': r.get('text'),
-                'sourceUrl': r.get('sourceUrl'),
-                'candidateType': r.get('candidateType','other'),
-                'qualityScore': r.get('qualityScore'),
-                'provenance': 'scraped',
-                'sample_phase': 'seed'
-            }
-            w.write(json.dumps(obj, ensure_ascii=False) + '\n')
+    chosen = load_spans(inp, [spans[i] for i in chosen])
+    # One 1 MiB buffered binary stream; records go out as UTF-8 bytes directly
+    with open(out, 'wb', buffering=1 << 20) as w:
+        w.writelines(dumps_line({
+            'id': idx,
+            'text': r.get('text'),
+            'sourceUrl': r.get('sourceUrl'),
+            'candidateType': r.get('candidateType','other'),
+            'qualityScore': r.get('qualityScore'),
+            'provenance': 'scraped',
+            'sample_phase': 'seed'
+        }) for idx, r in enumerate(chosen, start=1))
     return {'written': len(chosen), 'groups': plan}
 
 
@@ -13,6 +13,38 @@ from core.config import CrawlConfig
 from core.iojsonl import write_jsonl
 import json
 
+ECHO_FLUSH_BYTES = 1 << 16
+
+
+def echo_jsonl(records, out_path, flush_at: int = ECHO_FLUSH_BYTES) -> int:
+    """Write records as JSONL to ``out_path`` and stdout, batching writes.
+
+    Serialized lines are collected until about ``flush_at`` characters are
+    pending, then go out as one write (and one stdout flush) per sink instead
+    of two small writes per record. ``flush_at=0`` flushes every record.
+    Returns the number of records written.
+    """
+    buf: list[str] = []
+    pending = n = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        def flush():
+            chunk = "\n".join(buf) + "\n"
+            f.write(chunk)
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+            buf.clear()
+        for rec in records:
+            line = json.dumps(rec, ensure_ascii=False)
+            buf.append(line)
+            pending += len(line) + 1
+            n += 1
+            if pending >= flush_at:
+                flush()
+                pending = 0
+        if buf:
+            flush()
+    return n
+
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Depth-2 same-domain scraper")
     ap.add_argument("--url", required=True, help="Seed URL (starting point)")
@@ -42,14 +74,14 @@ def main(argv: list[str] | None = None) -> int:
     if args.logEvents:
         event_log_file = Path(args.logEvents)
         event_log_file.parent.mkdir(parents=True, exist_ok=True)
-        event_fp = event_log_file.open('w', encoding='utf-8')
+        event_fp = event_log_file.open('w', encoding='utf-8', buffering=ECHO_FLUSH_BYTES)
 
     def event_cb(ev):  # closure writes to stderr / file
-        import json as _json, sys as _sys
+        line = json.dumps(ev, ensure_ascii=False) + "\n"  # serialized once for both sinks
         if args.verbose:
-            _sys.stderr.write(_json.dumps(ev, ensure_ascii=False) + "\n")
+            sys.stderr.write(line)
         if event_fp:
-            event_fp.write(_json.dumps(ev, ensure_ascii=False) + "\n")
+            event_fp.write(line)
 
     cfg = CrawlConfig(
         seed=args.url,
@@ -70,11 +102,8 @@ def main(argv: list[str] | None = None) -> int:
         event_cb=event_cb if (args.verbose or event_fp) else None,
     )
     if args.echo:
-        with open(out_path, "w", encoding="utf-8") as f:
-            for rec in records_iter:
-                line = json.dumps(rec, ensure_ascii=False)
-                f.write(line + "\n")
-                print(line)
+        # A terminal still sees each page as it arrives; pipes get 64 KiB batches
+        echo_jsonl(records_iter, out_path, 0 if sys.stdout.isatty() else ECHO_FLUSH_BYTES)
     else:
         write_jsonl(records_iter, str(out_path))
     if event_fp:
@@ -31,21 +31,11 @@ import joblib
 
 from insights.heuristic import heuristic_classify
 from insights.adin_taxonomy import TAXONOMY_VERSION
+from core.iojsonl import read_jsonl as iter_jsonl
 
 LABELS = ["Risk","Advantage","Neutral"]
 
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                continue
-
-
 def split_holdout(X: List[str], y: List[str], frac: float=0.15, seed: int=42) -> Tuple[List[str],List[str],List[str],List[str]]:
     random.seed(seed)
     idx = list(range(len(X)))
@@ -62,27 +52,26 @@ def temperature_scale(logits, temp: float):
     return logits / temp
 
 
-def find_temperature(clf: LogisticRegression, X_hold, y_hold, temps=(0.5,0.75,1.0,1.25,1.5)):
+def find_temperature(clf: LogisticRegression, X_hold, y_hold, temps=(0.5,0.75,1.0,1.25,1.5), bins: int = 10):
     import numpy as np
     probs = clf.predict_proba(X_hold)
     best_t = 1.0
     best_ece = 1e9
     # simple ECE approximation
-    y_idx = [LABELS.index(v) for v in y_hold]
+    y_idx = np.array([LABELS.index(v) for v in y_hold])
+    edges = np.arange(bins + 1) / bins  # b/bins exactly, as the bin bounds were computed before
     for t in temps:
         scaled = temperature_scale(probs, t)
         scaled = scaled / scaled.sum(axis=1, keepdims=True)
-        # 10-bin ECE
-        bins = 10
-        ece = 0.0
-        for b in range(bins):
-            lo = b/bins; hi=(b+1)/bins
-            sel = (scaled.max(axis=1) >= lo) & (scaled.max(axis=1) < hi)
-            if not sel.any():
-                continue
-            acc = (scaled[sel].argmax(axis=1) == [y_idx[i] for i,v in enumerate(sel) if v]).mean()
-            conf = scaled[sel].max(axis=1).mean()
-            ece += abs(acc-conf)* (sel.sum()/len(scaled))
+        conf = scaled.max(axis=1)
+        # Bin b holds edges[b] <= conf < edges[b+1]; conf == 1.0 lands in no bin
+        bin_idx = np.searchsorted(edges, conf, side='right') - 1
+        keep = bin_idx < bins
+        bin_idx = bin_idx[keep]
+        hits = np.bincount(bin_idx, weights=(scaled.argmax(axis=1) == y_idx)[keep], minlength=bins)
+        conf_sum = np.bincount(bin_idx, weights=conf[keep], minlength=bins)
+        # |acc_b - conf_b| * n_b/N == |hits_b - conf_sum_b| / N; empty bins add 0
+        ece = float(np.abs(hits - conf_sum).sum() / len(scaled))
         if ece < best_ece:
             best_ece = ece
             best_t = t
@@ -106,12 +95,18 @@ def main():
     labels: List[str] = []
     pool_neutral: List[tuple[str,str,float]] = []
     pool_adv: List[tuple[str,str,float]] = []
-    kept = 0; scanned = 0
+    kept = 0; scanned = 0; duplicates = 0
+    # Crawled insights repeat boilerplate across pages; classify and train on each text once
+    seen: set[str] = set()
     for rec in iter_jsonl(args.inp):
         scanned += 1
         txt = rec.get('text')
         if not txt or len(txt) < 15:
             continue
+        if txt in seen:
+            duplicates += 1
+            continue
+        seen.add(txt)
         heur = heuristic_classify(txt)
         lab = heur['label']
         strength = heur['ruleStrength']
@@ -141,7 +136,7 @@ def main():
     # Diagnostics
     from collections import Counter
     dist = Counter(labels)
-    print(json.dumps({"diagnostics": {"label_counts": dist, "scanned": scanned, "kept": kept}}, default=str))
+    print(json.dumps({"diagnostics": {"label_counts": dist, "scanned": scanned, "duplicates": duplicates, "kept": kept}}, default=str))
     if args.requireAllLabels and any(l not in dist for l in LABELS):
         raise SystemExit(f"Missing label(s) after sampling: {set(LABELS) - set(dist)}. Use lower --minRuleStrength or increase augment.")
     if kept < 10:
@@ -20,17 +20,14 @@ from pathlib import Path
 from collections import defaultdict
 from typing import Dict, List
 
-LABELS = ["Advantage","Risk","Neutral"]
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
+if PARENT_DIR not in sys.path:
+    sys.path.insert(0, PARENT_DIR)
+
+from core.iojsonl import read_jsonl as iter_jsonl
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+LABELS = ["Advantage","Risk","Neutral"]
 
 def write_jsonl(path: Path, rows):
     with path.open('w',encoding='utf-8') as w:
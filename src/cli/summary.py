@@ -1,6 +1,9 @@
 from __future__ import annotations
 import argparse, json
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlsplit
 import sys, pathlib
 _root = pathlib.Path(__file__).resolve().parents[1]
 if str(_root) not in sys.path:
@@ -8,6 +11,29 @@ if str(_root) not in sys.path:
 
 from core.iojsonl import read_jsonl
 
+
+@lru_cache(maxsize=1024)
+def _prefix_hostname(prefix: str) -> str:
+    return urlsplit(prefix).hostname or ""
+
+
+def url_hostname(url) -> str:
+    """``urlparse(url).hostname or ''``, '' when the URL cannot be parsed.
+
+    The hostname only depends on the URL up to the end of its netloc (the
+    first ``/``, ``?`` or ``#`` after ``//``), so that prefix is parsed once
+    and cached; a crawl has few distinct prefixes.
+    """
+    try:
+        start = url.find("//")
+        if start >= 0:
+            ends = [i for i in (url.find(c, start + 2) for c in "/?#") if i >= 0]
+            if ends:
+                url = url[:min(ends)]
+        return _prefix_hostname(url)
+    except Exception:
+        return ""
+
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Summarize a scraped JSONL file")
     ap.add_argument("path", help="Path to JSONL file")
@@ -20,28 +46,21 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     count = 0
-    depths = {}
-    domains = {}
+    depths = Counter()
+    domains = Counter()
     first_records = []
 
     for rec in read_jsonl(str(p)):
         count += 1
-        d = rec.get("depth")
-        depths[d] = depths.get(d, 0) + 1
-        url = rec.get("url", "")
-        host = ""
-        try:
-            from urllib.parse import urlparse
-            host = urlparse(url).hostname or ""
-        except Exception:
-            pass
-        domains[host] = domains.get(host, 0) + 1
+        depths[rec.get("depth")] += 1
+        domains[url_hostname(rec.get("url", ""))] += 1
         if args.show and len(first_records) < args.show:
             first_records.append(rec)
 
     print("Total records:", count)
-    print("Depth distribution:", depths)
-    print("Domains:", domains)
+    # Plain dicts keep the first-seen key order of the printed output
+    print("Depth distribution:", dict(depths))
+    print("Domains:", dict(domains))
     if first_records:
         print("\nSample records:")
         for r in first_records:
@@ -15,6 +15,8 @@ import argparse, json, sys, os, math
 from typing import List, Dict, Tuple
 from pathlib import Path
 
+import numpy as np
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 if PARENT_DIR not in sys.path:
@@ -23,8 +25,10 @@ if PARENT_DIR not in sys.path:
 from insights.backends import load_backend
 from insights.classify import classify as heuristic_classify
 from insights.tag_inference import infer_with_validation
+from core.iojsonl import read_jsonl as iter_jsonl
 
 LABELS = ["Advantage","Risk","Neutral"]
+ADV, RISK, NEUTRAL = (LABELS.index(lab) for lab in ("Advantage", "Risk", "Neutral"))
 
 
 def build_parser():
@@ -37,20 +41,10 @@ def build_parser():
     p.add_argument('--f1Floor', type=float, default=0.9, help='Fraction of best macro F1 required when maximizing risk recall')
     p.add_argument('--topK', type=int, default=5, help='Show top K configs by macro F1')
     p.add_argument('--out', help='Write results JSON here')
+    p.add_argument('--batchSize', type=int, default=256, help='Texts per model inference call')
     return p
 
 
-def iter_jsonl(path: str):
-    with open(path,'r',encoding='utf-8') as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-
 def load_truth(path: str):
     m = {}
     for obj in iter_jsonl(path):
@@ -60,45 +54,55 @@ def load_truth(path: str):
     return m
 
 
-def evaluate(records: List[Dict]):
-    # Build confusion matrix
-    cm = {a:{b:0 for b in LABELS} for a in LABELS}
-    for r in records:
-        true = r['true']
-        pred = r['pred']
-        cm[true][pred] += 1
+def evaluate(y_true: np.ndarray, y_pred: np.ndarray):
+    """Metrics from integer label codes (indices into LABELS)."""
+    k = len(LABELS)
+    cm = np.bincount(y_true * k + y_pred, minlength=k * k).reshape(k, k)
     eps=1e-9
+    tp = np.diag(cm)
+    fp = cm.sum(axis=0) - tp
+    fn = cm.sum(axis=1) - tp
+    prec = tp/(tp+fp+eps); rec = tp/(tp+fn+eps)
+    f1 = 2*prec*rec/(prec+rec+eps)
     per_class={}
-    for lab in LABELS:
-        tp = cm[lab][lab]
-        fp = sum(cm[o][lab] for o in LABELS if o!=lab)
-        fn = sum(cm[lab][o] for o in LABELS if o!=lab)
-        prec = tp/(tp+fp+eps); rec = tp/(tp+fn+eps)
-        f1 = 2*prec*rec/(prec+rec+eps) if (prec+rec)>0 else 0
-        per_class[lab]={'precision':round(prec,3),'recall':round(rec,3),'f1':round(f1,3)}
+    for lab, p, r, f in zip(LABELS, prec.tolist(), rec.tolist(), f1.tolist()):
+        # int 0 (not 0.0) when precision and recall are both zero, as before
+        per_class[lab]={'precision':round(p,3),'recall':round(r,3),'f1':round(f,3) if (p+r)>0 else 0}
     macro_f1 = round(sum(v['f1'] for v in per_class.values())/len(LABELS),3)
     risk_recall = per_class['Risk']['recall']
-    return {'macro_f1': macro_f1, 'risk_recall': risk_recall, 'per_class': per_class, 'confusion_matrix': cm}
-
-
-def run_prediction(texts: List[str], model, risk_thr: float, adv_thr: float):
-    # We mimic hybrid logic
-    preds=[]
-    for t in texts:
-        heur = heuristic_classify(t)
-        probs = model.predict_proba([t])[0]
-        risk_p = probs.get('Risk',0.0)
-        adv_p = probs.get('Advantage',0.0)
-        label = heur.label
-        if label != 'Risk' and risk_p >= risk_thr:
-            label = 'Risk'
-        elif label == 'Neutral' and adv_p >= adv_thr:
-            label = 'Advantage'
-        # Tag inference risk precedence check
-        tag_inf = infer_with_validation(t)
-        if tag_inf.label == 'Risk':
-            label = 'Risk'
-        preds.append(label)
+    confusion = {a: dict(zip(LABELS, row)) for a, row in zip(LABELS, cm.tolist())}
+    return {'macro_f1': macro_f1, 'risk_recall': risk_recall, 'per_class': per_class, 'confusion_matrix': confusion}
+
+
+def precompute(texts: List[str], model, batch_size: int = 256):
+    """Threshold-independent inputs to the hybrid decision, one entry per text.
+
+    Returns ``(heur_codes, risk_p, adv_p, tag_risk)`` arrays (labels as
+    indices into LABELS) so the sweep classifies and runs the model once per
+    text rather than once per text per threshold pair. Model probabilities
+    come from one ``predict_proba_matrix`` call per ``batch_size`` texts.
+    """
+    probs = np.vstack([model.predict_proba_matrix(texts[i:i+batch_size])
+                       for i in range(0, len(texts), max(1, batch_size))])
+    model_labels = list(model.labels)
+    def column(lab):
+        # A label the model was not trained on has probability 0
+        return probs[:, model_labels.index(lab)].astype(np.float64) if lab in model_labels else np.zeros(len(texts))
+    heur_codes = [LABELS.index(heuristic_classify(t).label) for t in texts]
+    # Tag inference risk precedence check
+    tag_risk = [infer_with_validation(t).label == 'Risk' for t in texts]
+    return (np.array(heur_codes, dtype=np.int64), column('Risk'), column('Advantage'),
+            np.array(tag_risk, dtype=bool))
+
+
+def run_prediction(cached, risk_thr: float, adv_thr: float) -> np.ndarray:
+    # We mimic hybrid logic on the cached per-text inputs
+    heur_codes, risk_p, adv_p, tag_risk = cached
+    preds = heur_codes.copy()
+    preds[(preds != RISK) & (risk_p >= risk_thr)] = RISK
+    # Rows promoted to Risk above are no longer Neutral, matching the elif
+    preds[(preds == NEUTRAL) & (adv_p >= adv_thr)] = ADV
+    preds[tag_risk] = RISK
     return preds
 
 
@@ -122,14 +126,14 @@ def main(argv=None):
     if not dev_texts:
         print('No dev texts loaded', file=sys.stderr); sys.exit(1)
     model = load_backend(args.modelDir)
+    cached = precompute(dev_texts, model, args.batchSize)
+    y_true = np.array([LABELS.index(l) for l in dev_labels], dtype=np.int64)
 
     results = []
     best_macro = -1.0
     for r_thr in frange(*args.riskRange):
         for a_thr in frange(*args.advRange):
-            preds = run_prediction(dev_texts, model, r_thr, a_thr)
-            recs = [{'true': tl, 'pred': pl} for tl, pl in zip(dev_labels, preds)]
-            metrics = evaluate(recs)
+            metrics = evaluate(y_true, run_prediction(cached, r_thr, a_thr))
             metrics.update({'risk_threshold': r_thr, 'adv_threshold': a_thr})
             results.append(metrics)
             if metrics['macro_f1'] > best_macro:
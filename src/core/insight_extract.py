@@ -3,6 +3,8 @@ import re, json, hashlib, math
 from dataclasses import dataclass
 from typing import Iterable, List, Dict, Tuple, Sequence, Set, Callable
 
+from .iojsonl import read_jsonl
+
 SPLIT_REGEX = re.compile(r"(?<=[.!?])\s+|[\u2022\-\u2013] +")  # punctuation or bullet separators
 
 NOISE_PATTERNS = [
@@ -133,15 +135,7 @@ def extract_section(url: str) -> str:
 
 
 def iter_scraped_jsonl(path: str) -> Iterable[Dict]:
-    with open(path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    return read_jsonl(path)
 
 
 TYPE_KEYWORDS = {
@@ -1,6 +1,16 @@
 from __future__ import annotations
-import json
-from typing import Iterable, Mapping, Iterator, Any
+import json, mmap, os, re, shutil, sys
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, Mapping
+
+try:  # optional fast JSON (pip install tribute-pipeline[fast]); stdlib fallback
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads  # both accept bytes
+
+_READ_CHUNK = 1 << 20
 
 def write_jsonl(records_iterable: Iterable[Mapping], out_path: str) -> None:
     """Write an iterable of mapping records to a UTF-8 JSONL file."""
@@ -8,14 +18,261 @@ def write_jsonl(records_iterable: Iterable[Mapping], out_path: str) -> None:
         for rec in records_iterable:
             f.write(json.dumps(rec, ensure_ascii=False) + "\n")
 
-def read_jsonl(path: str) -> Iterator[Any]:
-    """Yield Python objects from a JSONL file lazily."""
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+def _tolist(obj: Any) -> Any:
+    tolist = getattr(obj, 'tolist', None)  # numpy arrays and scalars
+    if tolist is None:
+        raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+    return tolist()
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialise ``obj`` as one compact UTF-8 JSONL line (trailing newline included).
+
+    orjson and the stdlib fallback produce the same bytes for ordinary
+    records (no spaces after separators, non-ASCII kept as-is), so output
+    files and their checksums don't depend on which one is installed.
+    numpy arrays and scalars are accepted either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_tolist) + '\n').encode('utf-8')
+
+def write_json_stdout(obj: Any, indent: bool = False) -> None:
+    """Print ``obj`` as one JSON document + newline on the stdout byte stream.
+
+    Serialises straight to UTF-8 bytes (orjson when installed) and writes them
+    with a single call, skipping print()'s text layer; any pending text output
+    is flushed first so ordering is kept.
+    """
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | (orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        data = (json.dumps(obj, indent=2 if indent else None, ensure_ascii=False) + '\n').encode('utf-8')
+    sys.stdout.flush()
+    out = getattr(sys.stdout, 'buffer', None)
+    if out is None:  # replaced stdout without a byte layer (e.g. io.StringIO)
+        sys.stdout.write(data.decode('utf-8'))
+        return
+    out.write(data)
+    out.flush()
+
+
+def read_json(path: str | Path) -> Any:
+    """Parse one whole JSON document from ``path`` (bytes straight to the parser)."""
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+def read_jsonl(path: str | Path | BinaryIO) -> Iterator[Any]:
+    """Yield Python objects from a JSONL file lazily; blank and malformed lines are skipped.
+
+    ``path`` may also be an open binary stream such as ``sys.stdin.buffer``.
+    """
+    for lines in _line_batches(path):
+        yield from _parse_lines(lines)
+
+
+def read_jsonl_texts(path: str | Path) -> Iterator[str]:
+    """Yield the non-empty top-level ``text`` string of each JSONL record.
+
+    For consumers that need nothing else from a record: when ``"text"`` is a
+    plain string and nothing nested opens before it, only that string literal
+    is decoded and the rest of the line is never parsed. Anything else takes
+    the full-parse path, so results match ``rec.get('text')`` over
+    ``read_jsonl`` (except that a malformed line with such a leading text is
+    still yielded).
+    """
+    for lines in _line_batches(path):
+        yield from _extract_texts(lines)
+
+
+def read_jsonl_spans(path: str | Path) -> Iterator[tuple[int, int, Any]]:
+    """Yield ``(start, end, record)`` for each JSONL record of a regular file.
+
+    ``start``/``end`` are the byte offsets of the record's line (newline
+    excluded). Lines are found with ``mmap.find`` over a read-only mapping, so
+    a caller that keeps only a few fields per record can drop the parsed dict
+    and later re-read just the lines it picked with :func:`load_spans`.
+    Blank and malformed lines are skipped as in :func:`read_jsonl`.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap refuses zero-length files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            loads, isspace, find = _loads, bytes.isspace, mm.find
+            size = len(mm)
+            start = 0
+            while start < size:
+                end = find(b'\n', start)
+                if end < 0:
+                    end = size
+                line = mm[start:end]
+                if line and not isspace(line):
+                    try:
+                        rec = loads(line)
+                    except ValueError:
+                        pass
+                    else:
+                        yield start, end, rec
+                start = end + 1
+
+
+def load_spans(path: str | Path, spans: Iterable[tuple[int, int]]) -> list[Any]:
+    """Parse the records at the given ``(start, end)`` byte spans, in that order."""
+    spans = list(spans)
+    if not spans:
+        return []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [_loads(mm[start:end]) for start, end in spans]
+
+
+def _line_batches(path: str | Path | BinaryIO) -> Iterator[list[bytes]]:
+    """Yield the complete raw lines of each read as one list.
+
+    Reads 1 MiB binary chunks and splits them on ``b'\\n'`` itself instead of
+    iterating text-mode lines, so there is no per-line decode or readline
+    call; the partial last line of each chunk is carried into the next.
+    Chunks without a newline are only collected and joined once the line
+    ends, so a record spanning many chunks is not re-copied per chunk.
+    """
+    if hasattr(path, 'read'):
+        # Pipes: take whatever is available instead of blocking for a full chunk
+        yield from _split_chunks(getattr(path, 'read1', path.read))
+        return
+    with open(path, 'rb') as f:
+        yield from _split_chunks(f.read)
+
+
+def _split_chunks(read) -> Iterator[list[bytes]]:
+    pending: list[bytes] = []
+    while chunk := read(_READ_CHUNK):
+        if b'\n' not in chunk:
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(chunk)
+            chunk = b''.join(pending)
+            pending.clear()
+        lines = chunk.split(b'\n')
+        pending.append(lines.pop())
+        yield lines
+    if pending:
+        yield [b''.join(pending)]
+
+
+def _parse_lines(lines) -> Iterator[Any]:
+    # Locals instead of a global / attribute lookup per line
+    loads, isspace = _loads, bytes.isspace
+    for line in lines:
+        if not line or isspace(line):
+            continue
+        try:
+            yield loads(line)
+        except ValueError:  # JSONDecodeError (either parser) or invalid UTF-8
+            continue
+
+
+# String literal body in "unrolled loop" form: runs of plain bytes between escapes
+_TEXT_FIELD_RE = re.compile(rb'"text"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+
+
+def _extract_texts(lines) -> Iterator[str]:
+    loads, search = _loads, _TEXT_FIELD_RE.search
+    for line in lines:
+        m = search(line)
+        # Top level only if the record's own '{' is the sole opener before the key
+        if m is not None and line.count(b'{', 0, m.start()) == 1 and b'[' not in line[:m.start()]:
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
+                text = loads(b'"' + m.group(1) + b'"')
+            except ValueError:
+                continue
+        else:
+            for rec in _parse_lines((line,)):
+                text = rec.get('text') if isinstance(rec, dict) else None
+                break
+            else:
                 continue
+        if text and isinstance(text, str):
+            yield text
+
+
+def count_lines(path: str | Path) -> int:
+    """Count JSONL records without decoding or parsing; 0 if ``path`` is missing.
+
+    1 MiB binary reads + ``bytes.count`` (memchr) keep memory flat however
+    large the file; a final line without a trailing newline still counts.
+    """
+    n = 0
+    last = b''
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            while chunk := f.read(1 << 20):
+                n += chunk.count(b'\n')
+                last = chunk
+    except FileNotFoundError:
+        return 0
+    if last and not last.endswith(b'\n'):
+        n += 1
+    return n
+
+
+def write_bytes_atomic(path: str | Path, data: bytes) -> None:
+    """Write ``data`` to a temp file beside ``path`` then ``os.replace`` it in.
+
+    Readers see either the previous file or the complete new one, never a
+    truncated write.
+    """
+    path = Path(path)
+    # Exclusive create (not mkstemp) so the file gets the usual umask-derived mode
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp')
+    try:
+        with open(tmp, 'xb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def link_or_copy(src: str | Path, dst: str | Path) -> None:
+    """Make ``dst`` an alias of ``src``: hardlink, else symlink, else a plain copy.
+
+    Hardlinks cost one syscall and copy no bytes; the fallbacks cover
+    cross-device targets and filesystems without link support.
+    """
+    src, dst = Path(src), Path(dst)
+    if dst.is_symlink() or dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        dst.symlink_to(src.resolve())
+        return
+    except OSError:
+        pass
+    _copy_zero_copy(src, dst)
+
+
+def _copy_zero_copy(src: Path, dst: Path) -> None:
+    """Copy via os.sendfile (kernel-side, no userspace buffer) where available."""
+    if not hasattr(os, 'sendfile'):
+        shutil.copyfile(src, dst)
+        return
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        size = os.fstat(s.fileno()).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            # e.g. filesystems without sendfile support: finish in userspace
+            s.seek(offset)
+            shutil.copyfileobj(s, d)
@@ -14,13 +14,13 @@ Design goals:
  - Preserve previous CLI flag surface as much as reasonable.
 """
 from __future__ import annotations
-import argparse, json, sys, datetime, math
+import argparse, json, sys, time, math
 from pathlib import Path
 from typing import Optional, Dict, Any, Iterable
 
 from core.crawl import crawl
 from core.config import CrawlConfig
-from core.iojsonl import write_jsonl
+from core.iojsonl import write_jsonl, link_or_copy
 from insights import extract_insights as extract_insights_fn
 from insights.classifier_pipeline import ClassifierPipeline, PipelineConfig
 
@@ -28,7 +28,7 @@ from insights.classifier_pipeline import ClassifierPipeline, PipelineConfig
 import importlib
 
 def _utc_ts():
-    return datetime.datetime.now(datetime.UTC).strftime('%Y%m%d_%H%M%S')
+    return time.strftime('%Y%m%d_%H%M%S', time.gmtime())
 
 def _write_jsonl(iterable: Iterable[Dict[str, Any]], path: Path):
     with path.open('w', encoding='utf-8') as f:
@@ -82,7 +82,7 @@ def run_pipeline(
     _write_jsonl(records, pages_path)
     # alias
     try:
-        (work_dir / 'scraped_pages.jsonl').write_bytes(pages_path.read_bytes())
+        link_or_copy(pages_path, work_dir / 'scraped_pages.jsonl')
     except Exception:  # pragma: no cover
         pass
 
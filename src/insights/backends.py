@@ -9,7 +9,8 @@ without rewriting CLI integration logic. Two initial backends:
 All backends expose:
   - labels: ordered list of label names
   - lexicon_hash: reproducibility token (must match runtime lexicon)
-  - predict_proba(texts, lexicon)
+  - predict_proba_matrix(texts, lexicon) -> (N, K) ndarray in ``labels`` order
+  - predict_proba(texts, lexicon) -> one {label: prob} dict per text
   - save(out_dir, meta)
 
 Disk layout (backends share the same top-level file names):
@@ -41,9 +42,14 @@ LABELS = ["Advantage", "Risk", "Neutral"]
 class ModelBackend:
     backend_name: str = "abstract"
 
-    def predict_proba(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON) -> List[Dict[str, float]]:  # pragma: no cover - interface
+    def predict_proba_matrix(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON) -> np.ndarray:  # pragma: no cover - interface
+        """Class probabilities as an (N, K) array, columns in ``labels`` order."""
         raise NotImplementedError
 
+    def predict_proba(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON) -> List[Dict[str, float]]:
+        labs = self.labels
+        return [dict(zip(labs, row)) for row in self.predict_proba_matrix(texts, lexicon).tolist()]
+
     @property
     def labels(self) -> List[str]:  # pragma: no cover - interface
         raise NotImplementedError
@@ -105,17 +111,13 @@ class TfidfLogRegBackend(ModelBackend):
     def lexicon_hash(self):
         return self._lexicon_hash
 
-    def predict_proba(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
+    def predict_proba_matrix(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
         dense_dicts = [extract_features(t, lexicon).features for t in texts]
         X_text = self._vectorizer.transform(texts)
         X_dense = self._dense_adapter.transform(dense_dicts)
         from scipy.sparse import hstack  # local import
         X = hstack([X_text, X_dense])
-        probs = self._model.predict_proba(X)
-        out: List[Dict[str, float]] = []
-        for row in probs:
-            out.append({lab: float(row[i]) for i, lab in enumerate(self._labels)})
-        return out
+        return self._model.predict_proba(X)
 
     def save(self, out_dir: str | Path, meta: Dict[str, Any]):  # pragma: no cover IO
         d = Path(out_dir)
@@ -160,18 +162,14 @@ class HashingLogRegBackend(ModelBackend):
     def lexicon_hash(self):
         return self._lexicon_hash
 
-    def predict_proba(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
+    def predict_proba_matrix(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
         dense_dicts = [extract_features(t, lexicon).features for t in texts]
         X_h = self._hash.transform(texts)
         X_text = self._tfidf.transform(X_h)
         X_dense = self._dense_adapter.transform(dense_dicts)
         from scipy.sparse import hstack
         X = hstack([X_text, X_dense])
-        probs = self._model.predict_proba(X)
-        out: List[Dict[str, float]] = []
-        for row in probs:
-            out.append({lab: float(row[i]) for i, lab in enumerate(self._labels)})
-        return out
+        return self._model.predict_proba(X)
 
     def save(self, out_dir: str | Path, meta: Dict[str, Any]):  # pragma: no cover IO
         d = Path(out_dir)
@@ -317,17 +315,13 @@ class LegacyAdapter(ModelBackend):
     def lexicon_hash(self):
         return self._lexicon_hash
 
-    def predict_proba(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
+    def predict_proba_matrix(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
         dense_dicts = [extract_features(t, lexicon).features for t in texts]
         X_text = self._vectorizer.transform(texts)
         X_dense = self._dense_adapter.transform(dense_dicts)
         from scipy.sparse import hstack
         X = hstack([X_text, X_dense])
-        probs = self._model.predict_proba(X)
-        out: List[Dict[str, float]] = []
-        for row in probs:
-            out.append({lab: float(row[i]) for i, lab in enumerate(self._labels)})
-        return out
+        return self._model.predict_proba(X)
 
     def save(self, out_dir: str | Path, meta: Dict[str, Any]):  # pragma: no cover - not expected to save legacy
         raise NotImplementedError("Cannot save using legacy adapter")
@@ -426,10 +420,10 @@ class DistilBERTBackend(ModelBackend):
         import numpy as _np
         return _np.zeros((0, self._hidden_dim))
 
-    def predict_proba(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
-        if not texts:
-            return []
+    def predict_proba_matrix(self, texts: List[str], lexicon: Lexicon = DEFAULT_LEXICON):
         import numpy as _np
+        if not texts:
+            return _np.zeros((0, len(self._labels)))
         emb = self._embed_texts(texts)
         if self._use_dense:
             dense_dicts = [extract_features(t, lexicon).features for t in texts]
@@ -437,11 +431,7 @@ class DistilBERTBackend(ModelBackend):
             X = _np.hstack([emb, X_dense])
         else:
             X = emb
-        probs = self._model_head.predict_proba(X)
-        out: List[Dict[str, float]] = []
-        for row in probs:
-            out.append({lab: float(row[i]) for i, lab in enumerate(self._labels)})
-        return out
+        return self._model_head.predict_proba(X)
 
     def save(self, out_dir: str | Path, meta: Dict[str, Any]):  # pragma: no cover
         d = Path(out_dir)
@@ -6,6 +6,7 @@ Usage pattern:
     cfg = PipelineConfig(enable_self_train=True, enable_zero_shot=False)
     pipe = ClassifierPipeline(cfg, self_train_model_path='models/selftrain_embed')
     result = pipe.classify_text("Some insight text ...")
+    results = pipe.classify_texts(["First insight ...", "Second insight ..."])
 
 Output schema (dict):
   {
@@ -23,23 +24,31 @@ Goals:
   * Hide internal complexity behind a light config dataclass
 """
 from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import json, os, functools, re
 
 from .heuristic import heuristic_classify
 from .rationale import build_rationale
 
+try:  # optional linear-time regex engine (pip install google-re2)
+    import re2 as _re_email
+except ImportError:  # pragma: no cover
+    _re_email = re
+
 try:  # optional self-train
     from .self_train_infer import SelfTrainModel
 except Exception:  # pragma: no cover
     SelfTrainModel = None  # type: ignore
 
 try:  # optional zero-shot
-    from .zero_shot import zero_shot_classify
+    from .zero_shot import zero_shot_classify, zero_shot_classify_batch
 except Exception:  # pragma: no cover
     def zero_shot_classify(text: str, model_name: str = "facebook/bart-large-mnli"):
         return {"label": "Neutral", "available": False, "scores": {"Risk": 0.33, "Advantage": 0.33, "Neutral": 0.34}}
 
+    def zero_shot_classify_batch(texts, model_name: str = "facebook/bart-large-mnli", batch_size: int = 32):
+        return [zero_shot_classify(t, model_name) for t in texts]
+
 
 @dataclass
 class PipelineConfig:
@@ -124,10 +133,48 @@ class ClassifierPipeline:
         return 'unknown'
 
     def classify_text(self, text: str) -> Dict[str, Any]:
+        return self.classify_texts([text])[0]
+
+    def classify_texts(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """Classify many texts, batching self-train and zero-shot inference.
+
+        Heuristic scoring is per text; the model stages only see the texts
+        that reach them (same gating as the single-text path) in one call
+        each, so the output matches mapping classify_text over the list.
+        """
         # Basic PII scrubbing (emails, phone numbers). Extendable.
-        original_text = text
-        text = self._scrub_pii(text)
-        heur = heuristic_classify(text)
+        scrubbed = [self._scrub_pii(t) for t in texts]
+        heurs = [heuristic_classify(t) for t in scrubbed]
+        preds: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        if self.model and self.cfg.enable_self_train:
+            idx = [i for i, h in enumerate(heurs) if h.get('ruleStrength', 0.0) < self.cfg.strong_rule_threshold]
+            if idx:
+                for i, pred in zip(idx, self.model.predict([scrubbed[i] for i in idx])):
+                    preds[i] = pred
+        nlis: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        if self.cfg.enable_zero_shot:
+            if self.cfg.zero_shot_primary:
+                idx = list(range(len(texts)))
+            else:
+                idx = [i for i in range(len(texts)) if self._needs_fallback_nli(heurs[i], preds[i])]
+            if idx:
+                batch = zero_shot_classify_batch([scrubbed[i] for i in idx], self.cfg.zero_shot_model, batch_size=batch_size)
+                for i, nli in zip(idx, batch):
+                    nlis[i] = nli
+        return [self._fuse(texts[i], scrubbed[i], heurs[i], preds[i], nlis[i]) for i in range(len(texts))]
+
+    def _needs_fallback_nli(self, heur: Dict[str, Any], pred: Optional[Dict[str, Any]]) -> bool:
+        rule_strength = heur.get('ruleStrength', 0.0)
+        label = heur['label']
+        model_prob = None
+        if pred is not None:
+            if pred.get('probs'):
+                model_prob = max(pred['probs'].values())
+            label = pred.get('label', label)
+        top_p = model_prob if model_prob is not None else 0.0
+        return (model_prob is not None and top_p < self.cfg.model_floor) or (rule_strength < 0.4 and label == 'Neutral')
+
+    def _fuse(self, original_text: str, text: str, heur: Dict[str, Any], pred: Optional[Dict[str, Any]], nli_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         tag = heur.get('tag') or ''
         rule_strength = heur.get('ruleStrength', 0.0)
         signals = heur.get('signals', [])
@@ -142,7 +189,7 @@ class ClassifierPipeline:
 
         if self.cfg.enable_zero_shot and self.cfg.zero_shot_primary:
             # Run zero-shot first for semantic grounding
-            nli = zero_shot_classify(text, self.cfg.zero_shot_model)
+            nli = nli_result
             if nli and nli.get('available'):
                 label = nli.get('label', label)
                 original_nli_label = label
@@ -167,8 +214,7 @@ class ClassifierPipeline:
                 label = 'Risk'
                 provenance.append('risk-override')
             # Self-train (optional) can refine if enabled and heuristic weak & no override
-            if self.model and self.cfg.enable_self_train and rule_strength < self.cfg.strong_rule_threshold:
-                pred = self.model.predict([text])[0]
+            if pred is not None:
                 model_probs = pred.get('probs')
                 if model_probs:
                     model_prob = max(model_probs.values())
@@ -189,8 +235,7 @@ class ClassifierPipeline:
                     provenance.append('provisional-risk')
         else:
             # Original ordering: heuristic -> self-train -> zero-shot fallback
-            if self.model and self.cfg.enable_self_train and rule_strength < self.cfg.strong_rule_threshold:
-                pred = self.model.predict([text])[0]
+            if pred is not None:
                 model_probs = pred.get('probs')
                 if model_probs:
                     model_prob = max(model_probs.values())
@@ -198,10 +243,8 @@ class ClassifierPipeline:
                 provenance.append('self-train')
             # Fallback zero-shot condition
             if self.cfg.enable_zero_shot:
-                top_p = model_prob if model_prob is not None else 0.0
-                need_nli = (model_prob is not None and top_p < self.cfg.model_floor) or (rule_strength < 0.4 and label == 'Neutral')
-                if need_nli:
-                    nli = zero_shot_classify(text, self.cfg.zero_shot_model)
+                if nli_result is not None:
+                    nli = nli_result
                     if nli and nli.get('available'):
                         label = nli.get('label', label)
                         provenance.append('zero-shot-fallback')
@@ -266,24 +309,46 @@ class ClassifierPipeline:
 
     @staticmethod
     def _scrub_pii(text: str) -> str:
-        # Email pattern
-        email_pattern = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
-        text = email_pattern.sub('[REDACTED_EMAIL]', text)
+        text = _EMAIL_RE.sub('[REDACTED_EMAIL]', text)
         # IPv4 addresses (do before phone so digits not consumed)
-        ipv4_pattern = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
-        text = ipv4_pattern.sub('[REDACTED_IP]', text)
-        # Phone (simple international + US patterns)
-        phone_pattern = re.compile(r'(?:\+?\d[\s.-]?){7,15}(?:\d)')
-        def repl_phone(m):
-            digits = re.sub(r'\D','', m.group(0))
-            return '[REDACTED_PHONE]' if len(digits) >= 7 else m.group(0)
-        text = phone_pattern.sub(repl_phone, text)
-        # Ethereum-style wallet addresses 0x + 40 hex
-        wallet_pattern = re.compile(r'0x[a-fA-F0-9]{40}')
-        text = wallet_pattern.sub('[REDACTED_WALLET]', text)
-        # Very naive BTC address pattern (base58 length 26-35)
-        btc_pattern = re.compile(r'\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b')
-        text = btc_pattern.sub('[REDACTED_WALLET]', text)
+        text = _IPV4_RE.sub('[REDACTED_IP]', text)
+        text = _PHONE_RE.sub(_redact_phone, text)
+        text = _ETH_WALLET_RE.sub('[REDACTED_WALLET]', text)
+        text = _BTC_WALLET_RE.sub('[REDACTED_WALLET]', text)
         return text
 
-__all__ = ["ClassifierPipeline", "PipelineConfig"]
\ No newline at end of file
+
+# PII patterns, compiled once at import (_scrub_pii runs for every classified text).
+# Email is the backtracking-heavy one; use RE2's linear-time engine when installed.
+_EMAIL_RE = _re_email.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+_IPV4_RE = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+# Phone (simple international + US patterns)
+_PHONE_RE = re.compile(r'(?:\+?\d[\s.-]?){7,15}(?:\d)')
+_NON_DIGIT_RE = re.compile(r'\D')
+# Ethereum-style wallet addresses 0x + 40 hex
+_ETH_WALLET_RE = re.compile(r'0x[a-fA-F0-9]{40}')
+# Very naive BTC address pattern (base58 length 26-35)
+_BTC_WALLET_RE = re.compile(r'\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b')
+
+
+def _redact_phone(m) -> str:
+    digits = _NON_DIGIT_RE.sub('', m.group(0))
+    return '[REDACTED_PHONE]' if len(digits) >= 7 else m.group(0)
+
+
+_PIPELINE_CACHE: Dict[Any, ClassifierPipeline] = {}
+
+
+def get_pipeline(config: PipelineConfig, self_train_model_path: Optional[str] = None) -> ClassifierPipeline:
+    """Return a process-wide ClassifierPipeline for this config/model pair.
+
+    Repeated in-process classify runs (run_pipeline fast path, classify_worker)
+    reuse the loaded self-train model instead of rebuilding it per call.
+    """
+    key = (tuple(sorted(asdict(config).items())), self_train_model_path)
+    pipe = _PIPELINE_CACHE.get(key)
+    if pipe is None:
+        pipe = _PIPELINE_CACHE[key] = ClassifierPipeline(config, self_train_model_path=self_train_model_path)
+    return pipe
+
+__all__ = ["ClassifierPipeline", "PipelineConfig", "get_pipeline"]
@@ -36,6 +36,11 @@ except Exception:  # fallback simple implementations
         raw = 0.35*length_score + 0.25*num_score + 0.25*kw_score + 0.15*coher
         return round(min(max(raw,0.0),1.0),3)
 
+try:  # chunked bytes-mode reader; the text-mode loop below is the fallback
+    from core.iojsonl import read_jsonl as _read_jsonl
+except Exception:
+    _read_jsonl = None
+
 SPLIT_REGEX = re.compile(r"(?<=[.!?])\s+|[\u2022\-\u2013] +")
 
 # Investor signal patterns (expansion for investor-centric cues)
@@ -250,7 +255,17 @@ def extract_section(url: str) -> str:
 
 
 def iter_scraped_jsonl(path: str):
-    with open(path, 'r', encoding='utf-8') as f:
+    """Yield page records from a JSONL file, or from stdin when ``path`` is '-'."""
+    if _read_jsonl is not None:
+        import sys
+        yield from _read_jsonl(sys.stdin.buffer if path == '-' else path)
+        return
+    if path == '-':
+        import io, sys
+        f = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    else:
+        f = open(path, 'r', encoding='utf-8')
+    with f:
         for line in f:
             line = line.strip()
             if not line:
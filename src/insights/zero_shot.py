@@ -4,7 +4,7 @@ from __future__ import annotations
 Uses a transformers pipeline (bart-large-mnli or roberta-large-mnli) if available.
 If transformers is not installed, returns a stub indicating unavailability.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 _LABELS = ["Risk","Advantage","Neutral"]
 
@@ -29,6 +29,18 @@ try:  # lazy import
             'model': model_name,
             'available': True
         }
+
+    def zero_shot_classify_batch(texts: List[str], model_name: str = "facebook/bart-large-mnli", batch_size: int = 32) -> List[Dict[str,Any]]:
+        if not texts:
+            return []
+        pipe = _load(model_name)
+        res = pipe(list(texts), _LABELS, multi_label=False, batch_size=batch_size)
+        if isinstance(res, dict):
+            res = [res]
+        return [
+            {'label': r['labels'][0], 'scores': dict(zip(r['labels'], r['scores'])), 'model': model_name, 'available': True}
+            for r in res
+        ]
 except Exception:  # transformers not installed
     def zero_shot_classify(text: str, model_name: str = "facebook/bart-large-mnli") -> Dict[str,Any]:  # type: ignore
         return {
@@ -39,4 +51,7 @@ except Exception:  # transformers not installed
             'error': 'transformers_not_available'
         }
 
-__all__ = ["zero_shot_classify"]
+    def zero_shot_classify_batch(texts: List[str], model_name: str = "facebook/bart-large-mnli", batch_size: int = 32) -> List[Dict[str,Any]]:  # type: ignore
+        return [zero_shot_classify(t, model_name) for t in texts]
+
+__all__ = ["zero_shot_classify", "zero_shot_classify_batch"]
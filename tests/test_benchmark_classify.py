@@ -0,0 +1,39 @@
+import json
+
+from cli import benchmark_classify
+
+ROWS = [
+    {"text": "critical exploit risk in contracts", "label": "Risk"},
+    {"text": "throughput increases reduce costs", "label": "Advantage"},
+    {"text": "team publishes neutral operational update", "label": "Neutral"},
+    {"text": "governance attack could occur", "label": "Risk"},
+]
+
+
+def _run(tmp_path, n, workers):
+    data = tmp_path / 'in.jsonl'
+    with open(data, 'w', encoding='utf-8') as f:
+        for i in range(n):
+            r = ROWS[i % len(ROWS)]
+            f.write(json.dumps({'text': f"{r['text']} #{i}", 'label': r['label']}) + '\n')
+    out = tmp_path / f'bench_{workers}.json'
+    benchmark_classify.main(['--inputs', str(data), '--truth', str(data), '--workers', str(workers), '--out', str(out)])
+    return json.loads(out.read_text(encoding='utf-8'))
+
+
+def test_benchmark_in_process(tmp_path):
+    res = _run(tmp_path, len(ROWS), 1)
+    assert res['samples'] == len(ROWS) and res['workers'] == 1
+    heur = res['modes']['heuristic']
+    assert heur['runs'][0]['count'] == len(ROWS)
+    assert 'macro_f1' in heur['quality']
+
+
+def test_benchmark_worker_pool_matches_in_process(tmp_path):
+    # Two full chunks is the smallest input that actually uses the pool
+    n = 2 * benchmark_classify.PARALLEL_CHUNK
+    pooled = _run(tmp_path, n, 2)
+    serial = _run(tmp_path, n, 1)
+    assert pooled['workers'] == 2 and serial['workers'] == 1
+    assert pooled['modes']['heuristic']['runs'][0]['count'] == n
+    assert pooled['modes']['heuristic']['quality'] == serial['modes']['heuristic']['quality']
@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+from cli.calibration_report import apply_temperature, compute_ece
+
+
+def test_compute_ece_bins_and_weighted_gap():
+    probs = [{'Risk': 0.95, 'Neutral': 0.05}, {'Risk': 0.15, 'Neutral': 0.85},
+             {'Risk': 0.55, 'Neutral': 0.45}, {'Risk': 1.0, 'Neutral': 0.0}]
+    pred = ['Risk', 'Neutral', 'Risk', 'Risk']
+    gold = ['Risk', 'Risk', 'Risk', 'Neutral']
+    ece, bins = compute_ece(pred, probs, gold, 10)
+    # bin 9 holds 0.95 and 1.0 (clamped): acc 0.5, conf 0.975; bin 8: 0.85 wrong; bin 5: 0.55 right
+    expected = (2 * abs(0.5 - 0.975) + abs(0 - 0.85) + abs(1 - 0.55)) / 4
+    assert ece == pytest.approx(round(expected, 4))
+    assert [b['count'] for b in bins] == [0, 0, 0, 0, 0, 1, 0, 0, 1, 2]
+    assert bins[9] == {'bin': 9, 'count': 2, 'confidence': 0.975, 'accuracy': 0.5}
+    assert bins[0]['confidence'] is None
+
+
+def test_apply_temperature_matches_scalar_softmax():
+    rows = [{'Advantage': 0.7, 'Risk': 0.2, 'Neutral': 0.1}, {'Advantage': 0.0, 'Risk': 1.0, 'Neutral': 0.5}]
+    assert apply_temperature(rows, 1.0) is rows
+    out = apply_temperature(rows, 2.0)
+    for row, got in zip(rows, out):
+        vals = [min(max(v, 1e-12), 1 - 1e-12) for v in row.values()]
+        logits = [(math.log(v) - math.log(1 - v)) / 2.0 for v in vals]
+        m = max(logits)
+        z = sum(math.exp(lg - m) for lg in logits)
+        assert list(got) == list(row)
+        assert list(got.values()) == pytest.approx([math.exp(lg - m) / z for lg in logits])
+
+
+def test_self_train_find_temperature_binned_ece():
+    import numpy as np
+    from cli.self_train import find_temperature
+
+    class Fixed:
+        def predict_proba(self, X):
+            # columns follow self_train.LABELS: Risk, Advantage, Neutral
+            return np.array([[0.95, 0.03, 0.02], [0.1, 0.85, 0.05], [0.55, 0.25, 0.2], [1.0, 0.0, 0.0]])
+
+    t, ece = find_temperature(Fixed(), None, ['Risk', 'Risk', 'Risk', 'Neutral'], temps=(1.0,))
+    # bins 9, 8 and 5 hold one row each (right; wrong; right); the certain row is in no bin
+    assert t == 1.0
+    assert ece == pytest.approx((abs(1 - 0.95) + abs(0 - 0.85) + abs(1 - 0.55)) / 4)
@@ -0,0 +1,21 @@
+import json, subprocess, sys, pathlib
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+WORKER = ROOT / 'scripts' / 'classify_worker.py'
+
+
+def test_worker_answers_each_request_in_order():
+    reqs = [
+        {'id': 'a', 'text': 'Critical exploit risk in smart contracts could drain funds.'},
+        {'id': 'b'},
+        {'id': 'c', 'text': 'Throughput increased 35% reducing fees for users.', 'flags': {'debug': True}},
+    ]
+    payload = '\n'.join(json.dumps(r) for r in reqs) + '\nnot json\n'
+    proc = subprocess.run([sys.executable, str(WORKER)], input=payload, capture_output=True, text=True, cwd=ROOT)
+    assert proc.returncode == 0, proc.stderr
+    out = [json.loads(l) for l in proc.stdout.splitlines()]
+    assert [o['id'] for o in out] == ['a', 'b', 'c', None]
+    assert out[0]['label'] in {'Risk', 'Advantage', 'Neutral'} and 'confidence' in out[0]
+    assert out[1]['error'] == 'missing_text'
+    assert 'debug' in out[2]
+    assert out[3]['error'] == 'invalid_json'
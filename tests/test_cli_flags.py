@@ -33,3 +33,52 @@ def test_classify_help_contains_flags():
     # Unified classify CLI no longer exposes legacy flags like --metrics/--eval/--examples
     for flag in ['--in','--out','--config','--enable-self-train','--enable-zero-shot']:
         assert flag in out, f"Expected {flag} in classify help"
+
+
+def test_dispatcher_imports_only_the_requested_subcommand():
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    code = ("import sys; from cli.__main__ import main\n"
+            "try: main(['extract', '--help'])\n"
+            "except SystemExit: pass\n"
+            "print(sorted(m for m in sys.modules if m.startswith('cli.')), file=sys.stderr)")
+    proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    assert '--minhashFuzzy' in proc.stdout
+    assert "['cli.__main__', 'cli.extract_insights']" in proc.stderr
+
+
+def test_dispatcher_sniff_and_unknown_subcommand():
+    from cli.__main__ import _sniff_subcommand, main
+    assert _sniff_subcommand(['--help', 'reports', '--truth', 'x']) == (1, 'reports')
+    assert _sniff_subcommand(['-h']) == (None, None)
+    assert main(['bogus']) == 2
+
+
+def test_version_short_circuits_before_parser(capsys):
+    from unittest import mock
+    from cli import __main__ as dispatcher, generate_reports, package_version
+    assert re.fullmatch(r'\d+\.\d+\.\d+\S*', package_version())
+    with mock.patch.object(generate_reports, 'build_parser', side_effect=AssertionError('parser built')):
+        generate_reports.main(['--version'])
+        assert dispatcher.main(['reports', '-V']) is None
+    assert dispatcher.main(['-V']) == 0
+    assert capsys.readouterr().out == f'tribute-pipeline {package_version()}\n' * 3
+
+
+def test_scrape_echo_batches_writes(tmp_path, monkeypatch):
+    import io, json
+    from cli.scrape import echo_jsonl
+    writes = []
+    class Out(io.StringIO):
+        def write(self, s):
+            writes.append(s)
+            return super().write(s)
+    monkeypatch.setattr(sys, 'stdout', Out())
+    recs = [{'url': f'u{i}', 'text': 'é' * 30} for i in range(50)]
+    out = tmp_path / 'pages.jsonl'
+    assert echo_jsonl(iter(recs), out, flush_at=500) == 50
+    expected = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in recs)
+    assert out.read_text(encoding='utf-8') == sys.stdout.getvalue() == expected
+    assert 1 < len(writes) < 10
+    writes.clear()
+    echo_jsonl(iter(recs[:3]), out, flush_at=0)
+    assert len(writes) == 3
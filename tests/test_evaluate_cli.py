@@ -53,3 +53,41 @@ def test_evaluate_cli_compare(tmp_path):
     assert 'primary' in data and 'compare' in data
     assert data['primary']['backend'] in ('tfidf','legacy_tfidf','hashing')
     assert data['compare']['backend'] in ('tfidf','hashing','legacy_tfidf')
+
+
+def test_evaluate_backend_batched_confusion_and_f1():
+    sys.path.insert(0, str(ROOT / 'src'))
+    from cli.evaluate import evaluate_backend
+
+    class Stub:
+        backend_name = 'stub'
+
+        def predict_proba(self, texts, lexicon):
+            # 'Risk' and 'Neutral' tie for the first text: the first key wins
+            return [{'Risk': 0.4, 'Neutral': 0.4, 'Advantage': 0.2} if t == 'tie' else
+                    {'Risk': 0.1, 'Neutral': 0.1, 'Advantage': 0.8} for t in texts]
+
+    res = evaluate_backend(Stub(), ['tie', 'a', 'b'], ['Risk', 'Advantage', 'Neutral'], batch_size=2)
+    cm = res['confusion_matrix']
+    assert cm['Risk']['Risk'] == 1 and cm['Advantage']['Advantage'] == 1 and cm['Neutral']['Advantage'] == 1
+    assert res['per_class']['Advantage'] == {'precision': 0.5, 'recall': 1.0, 'f1': 0.667}
+    assert res['per_class']['Neutral']['f1'] == 0
+    assert res['macro_f1'] == round((1.0 + 0.667 + 0) / 3, 3)
+
+
+def test_evaluate_backend_scores_duplicates_once():
+    sys.path.insert(0, str(ROOT / 'src'))
+    from cli.evaluate import evaluate_backend
+
+    class Stub:
+        seen = []
+
+        def predict_proba(self, texts, lexicon):
+            self.seen.extend(texts)
+            return [{'Risk': 0.9, 'Neutral': 0.05, 'Advantage': 0.05} for _ in texts]
+
+    stub = Stub()
+    res = evaluate_backend(stub, ['x', 'y', 'x', 'x'], ['Risk'] * 4)
+    assert sorted(stub.seen) == ['x', 'y']
+    assert res['samples'] == 4 and res['unique_samples'] == 2
+    assert res['confusion_matrix']['Risk']['Risk'] == 4
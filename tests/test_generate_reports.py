@@ -0,0 +1,35 @@
+import json
+
+from cli.generate_reports import evaluate_stream, load_truth
+
+
+def _write(path, recs):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in recs), encoding='utf-8')
+
+
+def test_evaluate_confusion_and_metrics(tmp_path):
+    truth, preds = tmp_path / 'truth.jsonl', tmp_path / 'preds.jsonl'
+    _write(truth, [{'text': 'a', 'label': 'Risk'}, {'text': 'b', 'label': 'Risk'},
+                   {'text': 'c', 'label': 'Advantage'}, {'text': 'd', 'label': 'Other'}])
+    _write(preds, [{'text': 'a', 'label': 'Risk'}, {'text': 'b', 'label': 'Advantage'},
+                   {'text': 'c', 'label': 'Advantage'}, {'text': 'd', 'label': 'Risk'},
+                   {'text': 'zz', 'label': 'Risk'}, {'text': 'a', 'label': 'Bogus'}])
+    count, ev, _, _ = evaluate_stream(str(preds), load_truth(str(truth)))
+    assert count == 6
+    cm = ev['confusion_matrix']
+    assert cm['Risk'] == {'Advantage': 1, 'Risk': 1, 'Neutral': 0}
+    assert cm['Advantage'] == {'Advantage': 1, 'Risk': 0, 'Neutral': 0}
+    assert sum(cm['Neutral'].values()) == 0
+    assert ev['per_class']['Risk'] == {'precision': 1.0, 'recall': 0.5, 'f1': 0.667}
+    assert ev['per_class']['Neutral']['f1'] == 0
+    assert ev['macro_f1'] == round((0.667 + 0.667) / 3, 3)
+
+
+def test_stream_examples_match_full_sort_order(tmp_path):
+    preds = [{'text': f't{i}', 'label': 'Risk', 'confidence': c}
+             for i, c in enumerate([0.9, 0.8, 0.9, 0.4, 0.35, 0.4, 0.1] * 3)]
+    path = tmp_path / 'preds.jsonl'
+    _write(path, preds)
+    _, _, high, low = evaluate_stream(str(path), {})
+    assert high == sorted([p for p in preds if p['confidence'] >= 0.75], key=lambda x: -x['confidence'])[:10]
+    assert low == sorted([p for p in preds if 0.3 <= p['confidence'] <= 0.55], key=lambda x: x['confidence'])[:10]
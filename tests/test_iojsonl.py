@@ -0,0 +1,129 @@
+import json
+import os
+from unittest import mock
+
+from core.iojsonl import (count_lines, dumps_line, link_or_copy, load_spans, read_jsonl, read_jsonl_spans, read_jsonl_texts,
+                          write_bytes_atomic, write_jsonl)
+
+
+def test_write_read_roundtrip(tmp_path):
+    p = tmp_path / 'r.jsonl'
+    recs = [{'text': 'ünïcode', 'n': 1}, {'text': 'b', 'n': 2}]
+    write_jsonl(recs, str(p))
+    with p.open('a', encoding='utf-8') as f:
+        f.write('\n{not json}\n')
+    assert list(read_jsonl(str(p))) == recs
+
+
+def test_link_or_copy_hardlinks_and_replaces_existing(tmp_path):
+    src = tmp_path / 'pages.jsonl'
+    src.write_text('{"a": 1}\n', encoding='utf-8')
+    dst = tmp_path / 'scraped_pages.jsonl'
+    dst.write_text('stale', encoding='utf-8')
+    link_or_copy(src, dst)
+    assert os.path.samefile(src, dst)
+
+
+def test_link_or_copy_falls_back_to_copy(tmp_path):
+    src = tmp_path / 'pages.jsonl'
+    src.write_text('{"a": 1}\n', encoding='utf-8')
+    dst = tmp_path / 'scraped_pages.jsonl'
+    with mock.patch('os.link', side_effect=OSError), \
+         mock.patch('pathlib.Path.symlink_to', side_effect=OSError):
+        link_or_copy(src, dst)
+    assert not dst.is_symlink()
+    assert dst.read_text(encoding='utf-8') == '{"a": 1}\n'
+
+
+def test_link_or_copy_copies_without_sendfile(tmp_path):
+    src = tmp_path / 'pages.jsonl'
+    src.write_bytes(b'{"a": 1}\n' * 50000)
+    dst = tmp_path / 'scraped_pages.jsonl'
+    with mock.patch('os.link', side_effect=OSError), \
+         mock.patch('pathlib.Path.symlink_to', side_effect=OSError), \
+         mock.patch('os.sendfile', side_effect=OSError):
+        link_or_copy(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
+
+
+def test_write_bytes_atomic_replaces_without_leftovers(tmp_path):
+    p = tmp_path / 'summary.json'
+    p.write_bytes(b'old')
+    write_bytes_atomic(p, b'{"ok": true}')
+    assert p.read_bytes() == b'{"ok": true}'
+    assert [f.name for f in tmp_path.iterdir()] == ['summary.json']
+
+
+def test_count_lines_handles_missing_empty_and_unterminated(tmp_path):
+    p = tmp_path / 'x.jsonl'
+    assert count_lines(p) == 0
+    p.write_bytes(b'')
+    assert count_lines(p) == 0
+    p.write_bytes(b'{"a": 1}\n{"a": 2}')
+    assert count_lines(p) == 2
+
+
+def test_read_jsonl_lines_straddling_chunks(tmp_path, monkeypatch):
+    import core.iojsonl as iojsonl
+    monkeypatch.setattr(iojsonl, '_READ_CHUNK', 7)
+    p = tmp_path / 'r.jsonl'
+    recs = [{'text': 'x' * n, 'n': n} for n in (0, 3, 40)]
+    p.write_bytes(b'\n'.join(json.dumps(r).encode() for r in recs) + b'\n  \n\r\n' + b'{"tail": true}')
+    assert list(read_jsonl(p)) == recs + [{'tail': True}]
+
+
+def test_read_jsonl_record_spanning_many_chunks(tmp_path, monkeypatch):
+    import core.iojsonl as iojsonl
+    monkeypatch.setattr(iojsonl, '_READ_CHUNK', 16)
+    p = tmp_path / 'r.jsonl'
+    recs = [{'text': 'y' * 5000}, {'n': 1}]
+    p.write_text(''.join(json.dumps(r) + '\n' for r in recs), encoding='utf-8')
+    assert list(read_jsonl(p)) == recs
+
+
+def test_read_jsonl_texts_matches_full_parse(tmp_path):
+    p = tmp_path / 'raw.jsonl'
+    recs = [
+        {'sourceUrl': 'u', 'text': 'quote " and \\ and é'},
+        {'meta': {'text': 'nested'}, 'text': 'top'},
+        {'evidence': ['{'], 'text': 'after list'},
+        {'section': 'text', 'text': 'value named text first'},
+        {'text': None}, {'text': ''}, {'other': 1},
+    ]
+    p.write_text(''.join(json.dumps(r) + '\n' for r in recs) + 'not json\n', encoding='utf-8')
+    expected = [r.get('text') for r in read_jsonl(p) if r.get('text')]
+    assert list(read_jsonl_texts(p)) == expected == ['quote " and \\ and é', 'top', 'after list', 'value named text first']
+
+
+def test_read_jsonl_from_pipe_yields_before_eof():
+    r, w = os.pipe()
+    with os.fdopen(r, 'rb') as rf, os.fdopen(w, 'wb') as wf:
+        wf.write(b'{"a": 1}\n{"a": 2}\n{"a"')
+        wf.flush()
+        it = read_jsonl(rf)
+        # Only the complete lines are available; a full-chunk read would block here
+        assert [next(it), next(it)] == [{'a': 1}, {'a': 2}]
+        wf.write(b': 3}')
+        wf.close()
+        assert list(it) == [{'a': 3}]
+
+
+def test_read_jsonl_spans_reload_selected_lines(tmp_path):
+    p = tmp_path / 'r.jsonl'
+    p.write_bytes(b'{"n": 1}\n\n  \n{bad\n{"n": "\xc3\xa9"}\r\n{"n": 3}')
+    found = list(read_jsonl_spans(p))
+    assert [rec for _, _, rec in found] == list(read_jsonl(p)) == [{'n': 1}, {'n': 'é'}, {'n': 3}]
+    spans = [(s, e) for s, e, _ in found]
+    assert load_spans(p, [spans[2], spans[0]]) == [{'n': 3}, {'n': 1}]
+    empty = tmp_path / 'empty.jsonl'
+    empty.write_bytes(b'')
+    assert list(read_jsonl_spans(empty)) == [] and load_spans(empty, []) == []
+
+
+def test_dumps_line_same_bytes_with_and_without_orjson(monkeypatch):
+    import numpy as np
+    import core.iojsonl as iojsonl
+    rec = {'text': 'ünïcode "q"', 'label': None, 'conf': 0.25, 'probs': np.array([0.5, 0.25]), 'n': np.int64(3)}
+    fast = dumps_line(rec)
+    monkeypatch.setattr(iojsonl, 'orjson', None)
+    assert dumps_line(rec) == fast == '{"text":"ünïcode \\"q\\"","label":null,"conf":0.25,"probs":[0.5,0.25],"n":3}\n'.encode('utf-8')
@@ -30,3 +30,14 @@ def test_tag_vocabulary_enforcement():
     pipe = ClassifierPipeline(PipelineConfig(enable_self_train=False, enable_zero_shot=False))
     rec = pipe.classify_text('Unrelated content with arbitrary jargon foobarization quantum synergy 42%.')
     assert rec['labelTag'] in {'Other'}
+
+
+def test_classify_texts_matches_per_text():
+    pipe = ClassifierPipeline(PipelineConfig(enable_self_train=False, enable_zero_shot=True, debug=True))
+    texts = [
+        'Revenue grew 40% year over year driven by enterprise adoption.',
+        'Regulatory scrutiny and lawsuits threaten the core business.',
+        'The company was founded in 2015.',
+    ]
+    assert pipe.classify_texts(texts) == [pipe.classify_text(t) for t in texts]
+    assert pipe.classify_texts([]) == []
@@ -0,0 +1,38 @@
+import json
+
+from cli.prepare_balanced_seed_batch import load_groups, select_balanced
+from core.iojsonl import load_spans
+
+
+def _write(path, recs):
+    path.write_text(''.join(json.dumps(r) + '\n' for r in recs), encoding='utf-8')
+
+
+def test_balanced_selection_groups_and_quality_preference(tmp_path):
+    recs = [{'text': f'r{i}', 'candidateType': t, 'qualityScore': q}
+            for i, (t, q) in enumerate([('risk', 0.9), ('risk', 0.1), ('risk', 0.5), ('metric', None),
+                                        ('metric', 'x'), (None, 0.8), ('risk', 0.95), ('metric', 0.76)])]
+    recs.append({'text': '', 'candidateType': 'risk'})
+    path = tmp_path / 'in.jsonl'
+    _write(path, recs)
+    spans, groups, quality = load_groups(str(path))
+    assert len(spans) == 8
+    assert [r['text'] for r in load_spans(str(path), [spans[i] for i in (7, 0)])] == ['r7', 'r0']
+    assert list(groups) == ['risk', 'metric', 'other']
+    assert groups['risk'].tolist() == [0, 1, 2, 6]
+    assert quality.tolist() == [0, 2, 1, 2, 2, 0, 0, 0]
+    picked, allocated = select_balanced(groups, quality, 6, 1, seed=3)
+    assert len(picked) == len(set(picked)) == 6
+    assert allocated == {'risk': 3, 'metric': 2, 'other': 1}
+    assert picked == select_balanced(groups, quality, 6, 1, seed=3)[0]
+
+
+def test_quality_bucket_edges_and_nan():
+    import math
+    from cli import prepare_balanced_seed_batch as balanced, prepare_seed_batch as seed
+    scores = [0.4499, 0.45, 0.5, 0.7499999, 0.75, 1.0, -1.0, math.nan, math.inf]
+    assert [balanced.QUALITY_ORDER[i] for i in balanced.quality_bucket_ids(scores)] == \
+        ['low', 'mid', 'mid', 'mid', 'high', 'high', 'low', 'low', 'high']
+    assert [seed.QUALITY_BUCKETS[i] for i in seed.quality_bucket_ids(scores)] == \
+        ['low', 'low', 'mid', 'mid', 'high', 'high', 'low', 'low', 'high']
+    assert math.isnan(balanced._score('bad')) and balanced._score('0.8') == 0.8
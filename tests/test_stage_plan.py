@@ -0,0 +1,35 @@
+import json, os, subprocess, sys, time, pathlib
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / 'scripts' / 'regenerate_artifacts.py'
+
+
+def dry_run(out_dir, *extra):
+    cmd = [sys.executable, str(SCRIPT), '--url', 'https://example.com', '--outDir', str(out_dir), '--dry-run', *extra]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)['stages']
+
+
+def test_dry_run_fresh_dir_runs_everything(tmp_path):
+    stages = dry_run(tmp_path / 'fresh')
+    assert set(stages.values()) == {'run'}
+    assert not (tmp_path / 'fresh').exists()
+
+
+def test_stages_skips_fresh_outputs_and_reruns_stale(tmp_path):
+    names = ['pages.jsonl', 'insights_raw.jsonl', 'insights_classified.jsonl', 'diagnostics.json',
+             'health.json', 'qualitative_examples.md', 'audit_evidence_labeltag.json']
+    base = time.time() - 100
+    for i, n in enumerate(names):
+        p = tmp_path / n
+        p.write_text('{}', encoding='utf-8')
+        os.utime(p, (base + i, base + i))
+    stages = dry_run(tmp_path, '--stages', 'audit')
+    assert stages['audit'] == 'run'
+    assert all(v == 'skip' for k, v in stages.items() if k != 'audit')
+    # Newer classified output makes every downstream stage stale
+    os.utime(tmp_path / 'insights_classified.jsonl', (base + 50, base + 50))
+    stages = dry_run(tmp_path, '--stages', 'audit')
+    assert stages['classify'] == 'skip'
+    assert all(stages[k] == 'run' for k in ('diagnostics', 'health', 'qualitative', 'audit'))
@@ -0,0 +1,45 @@
+import numpy as np
+
+from cli.threshold_tune import LABELS, evaluate, run_prediction
+
+
+def test_run_prediction_hybrid_precedence():
+    codes = {lab: i for i, lab in enumerate(LABELS)}
+    cached = (np.array([codes[lab] for lab in ['Neutral', 'Neutral', 'Advantage', 'Neutral', 'Risk', 'Advantage']]),
+              np.array([0.7, 0.2, 0.65, 0.1, 0.0, 0.1]),
+              np.array([0.9, 0.6, 0.9, 0.59, 0.9, 0.9]),
+              np.array([False, False, False, False, False, True]))
+    preds = run_prediction(cached, 0.65, 0.6)
+    # risk promotion wins over advantage; only Neutral rows get advantage; tag risk overrides all
+    assert [LABELS[i] for i in preds] == ['Risk', 'Advantage', 'Risk', 'Neutral', 'Risk', 'Risk']
+    assert cached[0][0] == codes['Neutral']
+
+
+def test_evaluate_from_codes():
+    codes = {lab: i for i, lab in enumerate(LABELS)}
+    true = np.array([codes[l] for l in ['Risk', 'Risk', 'Advantage', 'Neutral']])
+    pred = np.array([codes[l] for l in ['Risk', 'Advantage', 'Advantage', 'Risk']])
+    m = evaluate(true, pred)
+    assert m['confusion_matrix']['Risk'] == {'Advantage': 1, 'Risk': 1, 'Neutral': 0}
+    assert m['per_class']['Risk'] == {'precision': 0.5, 'recall': 0.5, 'f1': 0.5}
+    assert m['per_class']['Neutral'] == {'precision': 0.0, 'recall': 0.0, 'f1': 0}
+    assert type(m['per_class']['Neutral']['f1']) is int
+    assert m['risk_recall'] == 0.5 and m['macro_f1'] == round((0.667 + 0.5) / 3, 3)
+
+
+def test_precompute_batches_model_calls_and_maps_columns():
+    from cli.threshold_tune import precompute
+
+    class Model:
+        labels = ['Neutral', 'Risk']  # no Advantage column
+        calls = []
+
+        def predict_proba_matrix(self, texts):
+            self.calls.append(len(texts))
+            return np.array([[0.25, 0.75]] * len(texts))
+
+    model = Model()
+    heur, risk_p, adv_p, tag_risk = precompute(['Slashing risk is high.', 'Plain text here.', 'More text.'], model, batch_size=2)
+    assert model.calls == [2, 1]
+    assert risk_p.tolist() == [0.75] * 3 and adv_p.tolist() == [0.0] * 3
+    assert len(heur) == len(tag_risk) == 3
@@ -14,3 +14,12 @@ def test_in_scope_root_and_subdomain():
 def test_canonical_url_trailing_slash():
     assert canonical_url("https://example.com/path/") == "https://example.com/path"
     assert canonical_url("https://example.com/") == "https://example.com/"
+
+
+def test_summary_url_hostname_matches_urlparse():
+    from urllib.parse import urlparse
+    from cli.summary import url_hostname
+    urls = ['https://u:p@Host.EXAMPLE.org:8080/p?q#f', 'HTTP://X.COM?q=//y', 'http://x.com#//y/z', '//x.com/a',
+            'http:/x//y', 'http://[::1]:80/x', 'mailto:a@b.c', '']
+    assert [url_hostname(u) for u in urls * 2] == [urlparse(u).hostname or '' for u in urls * 2]
+    assert url_hostname('http://[::1/x') == url_hostname(None) == ''